@@ -0,0 +1,141 @@
+"""
+Recruiter analytics from pre-aggregated application rollups
+
+Every new application adds to one ``ApplicationDailyStat`` row (job, day,
+'pending') in the same transaction; those rows are the applied counts. A
+status change moves the application from its old status's row (on the day
+it entered that status) to the new status's row, so the other statuses
+count applications by their current status, dated when they entered it.
+The analytics page never touches the ``application`` table: it reads at
+most one row per job, day and status inside the selected window, however
+many applications the jobs have received.
+
+Recruiters can only move an application out of pending (``REVIEW_STATUSES``),
+so an application is counted as applied exactly once.
+
+``flask --app app backfill-analytics`` rebuilds the rollups of live jobs
+from their applications. Only the current status of an application is stored, so the
+backfill credits each application with one move from pending straight to
+its current status, dated at its last update.
+"""
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+from database import increment_or_insert
+from extensions import db
+from models import Application, ApplicationDailyStat, Job
+
+STATUSES = ('pending', 'reviewed', 'accepted', 'rejected')
+REVIEW_STATUSES = STATUSES[1:]  # the statuses a recruiter can set
+WINDOWS_DAYS = (7, 30, 90)
+_BACKFILL_BATCH_SIZE = 5000
+
+Funnel = namedtuple('Funnel', 'applied reviewed accepted rejected reviewed_count review_seconds')
+
+
+def _record(job_id, day, status, count=1, reviewed_count=0, review_seconds=0.0):
+    increment_or_insert(
+        db, ApplicationDailyStat,
+        {'job_id': job_id, 'day': day, 'status': status},
+        {'count': count, 'reviewed_count': reviewed_count, 'review_seconds': review_seconds},
+    )
+
+
+def record_application(job_id, applied_at):
+    """Count a new (pending) application; call before committing it"""
+    _record(job_id, applied_at.date(), 'pending')
+
+
+def record_status_change(application, old_status, old_since, changed_at):
+    """Move ``application`` from ``old_status`` (entered at ``old_since``) to its new status
+
+    Call before committing the change. Pending rows only count new
+    applications, so the new status can't be pending.
+    """
+    if application.status == old_status:
+        return
+    if application.status not in REVIEW_STATUSES:
+        raise ValueError(f'Cannot move an application to {application.status!r}')
+    if old_status == 'pending':
+        waited = (changed_at - application.applied_at).total_seconds()
+        _record(application.job_id, changed_at.date(), application.status, reviewed_count=1, review_seconds=waited)
+    else:
+        since = old_since or application.applied_at or changed_at
+        _record(application.job_id, since.date(), old_status, count=-1)
+        _record(application.job_id, changed_at.date(), application.status)
+
+
+def funnel(job_ids, days, today=None):
+    """Totals and per-day applications for ``job_ids`` over the last ``days`` days
+
+    Returns ``(totals, by_job, per_day)``: a Funnel for all the jobs, a
+    Funnel per job id, and a list of (day, applications) for every day in
+    the window.
+    """
+    today = today or datetime.utcnow().date()  # rollup days are UTC, like applied_at
+    start = today - timedelta(days=days - 1)
+    rows = db.session.query(ApplicationDailyStat).filter(
+        ApplicationDailyStat.job_id.in_(job_ids),
+        ApplicationDailyStat.day >= start,
+    ).all() if job_ids else []
+
+    def empty():
+        return {'pending': 0, 'reviewed': 0, 'accepted': 0, 'rejected': 0, 'reviewed_count': 0, 'review_seconds': 0.0}
+
+    total, per_job, daily = empty(), {}, {}
+    for row in rows:
+        for bucket in (total, per_job.setdefault(row.job_id, empty())):
+            bucket[row.status] = bucket.get(row.status, 0) + row.count
+            bucket['reviewed_count'] += row.reviewed_count
+            bucket['review_seconds'] += row.review_seconds
+        if row.status == 'pending':
+            daily[row.day] = daily.get(row.day, 0) + row.count
+
+    def to_funnel(bucket):
+        return Funnel(bucket['pending'], bucket['reviewed'], bucket['accepted'], bucket['rejected'],
+                      bucket['reviewed_count'], bucket['review_seconds'])
+
+    per_day = [(start + timedelta(days=i), daily.get(start + timedelta(days=i), 0)) for i in range(days)]
+    return to_funnel(total), {job_id: to_funnel(bucket) for job_id, bucket in per_job.items()}, per_day
+
+
+def backfill():
+    """Rebuild the rollup rows of live jobs from the application table; return applications read
+
+    Archived jobs keep their rollups: their applications are no longer in
+    the application table to rebuild them from.
+    """
+    counts = {}
+    read = 0
+    query = db.session.query(
+        Application.job_id, Application.status, Application.applied_at, Application.updated_at
+    ).order_by(Application.id).yield_per(_BACKFILL_BATCH_SIZE)
+    for job_id, status, applied_at, updated_at in query:
+        read += 1
+        if applied_at is None:
+            continue
+        key = (job_id, applied_at.date(), 'pending')
+        counts[key] = _add(counts.get(key), 1, 0, 0.0)
+        if status and status != 'pending':
+            changed_at = updated_at or applied_at
+            key = (job_id, changed_at.date(), status)
+            counts[key] = _add(counts.get(key), 1, 1, max((changed_at - applied_at).total_seconds(), 0.0))
+
+    db.session.query(ApplicationDailyStat).filter(
+        ApplicationDailyStat.job_id.in_(db.session.query(Job.id))
+    ).delete(synchronize_session=False)
+    rows = [
+        {'job_id': job_id, 'day': day, 'status': status,
+         'count': count, 'reviewed_count': reviewed_count, 'review_seconds': review_seconds}
+        for (job_id, day, status), (count, reviewed_count, review_seconds) in counts.items()
+    ]
+    for start in range(0, len(rows), _BACKFILL_BATCH_SIZE):
+        db.session.execute(db.insert(ApplicationDailyStat), rows[start:start + _BACKFILL_BATCH_SIZE])
+    db.session.commit()
+    return read
+
+
+def _add(current, count, reviewed_count, review_seconds):
+    if current is None:
+        return count, reviewed_count, review_seconds
+    return current[0] + count, current[1] + reviewed_count, current[2] + review_seconds
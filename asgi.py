@@ -0,0 +1,69 @@
+"""
+ASGI entry point for the async serving mode
+
+    uvicorn asgi:app
+    LIVE_EVENTS_ENABLED=False uvicorn asgi:app --workers 4
+
+The Flask app is wrapped with asgiref's WSGI adapter. Each request still
+runs in a thread (up to ``ASGI_THREADS`` per process). The views in
+async_views.py run their queries on the server's event loop through the
+async engine instead of holding a pooled connection per query.
+``ASYNC_VIEWS_ENABLED=False`` serves the plain sync views, which is handy
+for comparing the two with benchmarks/async_serving.py. The WSGI entry
+point (``gunicorn app:app``) is unchanged. Live events (live_events.py) need
+a single process, so more workers need ``LIVE_EVENTS_ENABLED=False``.
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from asgiref.wsgi import WsgiToAsgiInstance
+
+import async_db
+import async_views
+from app import app as flask_app
+
+# asgiref runs every request on one shared thread (thread_sensitive=True);
+# run them on a pool of their own instead
+_run_wsgi_app = WsgiToAsgiInstance.__dict__['run_wsgi_app'].func
+
+
+class ThreadedWsgiInstance(WsgiToAsgiInstance):
+    def __init__(self, wsgi_application, executor):
+        super().__init__(wsgi_application)
+        self.executor = executor
+
+    async def run_wsgi_app(self, body):
+        return await sync_to_async(_run_wsgi_app, thread_sensitive=False, executor=self.executor)(self, body)
+
+
+class AsgiApp:
+    """ASGI application serving a Flask app from a thread pool"""
+
+    def __init__(self, wsgi_application, threads):
+        self.wsgi_application = wsgi_application
+        # Separate from the loop's default executor, which the async views use
+        # for rendering; sharing one pool could leave them waiting on each other
+        self.executor = ThreadPoolExecutor(threads, thread_name_prefix='asgi-request')
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self.lifespan(receive, send)
+        else:
+            await ThreadedWsgiInstance(self.wsgi_application, self.executor)(scope, receive, send)
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await async_db.dispose_all()
+                self.executor.shutdown(wait=False)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+
+if flask_app.config['ASYNC_VIEWS_ENABLED']:
+    async_views.install(flask_app)
+
+app = AsgiApp(flask_app, flask_app.config['ASGI_THREADS'])
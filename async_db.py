@@ -0,0 +1,100 @@
+"""
+Async SQLAlchemy engine for the async serving mode
+
+Used by the async views in async_views.py when the app is served through
+asgi.py. The engine shares the models and the database of the regular
+Flask-SQLAlchemy setup but connects through an asyncio driver:
+
+    sqlite://...      -> sqlite+aiosqlite://...
+    postgresql://...  -> postgresql+asyncpg://...
+
+``ASYNC_DATABASE_URL`` overrides the derived URL. Engines and their pools
+belong to the event loop they were created on, so one engine is kept per
+process and loop.
+"""
+import asyncio
+import os
+from contextlib import asynccontextmanager
+
+from flask import current_app
+from sqlalchemy import event
+
+import database
+import profiling
+
+try:
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+except ImportError:  # the async extras (greenlet) are optional
+    AsyncSession = create_async_engine = None
+
+_DRIVERS = {
+    'sqlite': 'sqlite+aiosqlite',
+    'postgresql': 'postgresql+asyncpg',
+    'postgresql+psycopg2': 'postgresql+asyncpg',
+}
+
+_engines = {}
+
+
+def async_url(url):
+    """Map a sync database URL onto its asyncio driver"""
+    scheme, sep, rest = url.partition('://')
+    return _DRIVERS.get(scheme, scheme) + sep + rest
+
+
+def engine_options(app_config, url):
+    options = database.engine_options(app_config, url)
+    # psycopg2's libpq 'options' string has an asyncpg equivalent
+    connect_args = options.pop('connect_args', None)
+    if connect_args and url.startswith('postgresql+asyncpg'):
+        timeout = app_config['DB_STATEMENT_TIMEOUT_MS']
+        options['connect_args'] = {'server_settings': {'statement_timeout': str(timeout)}}
+    return options
+
+
+def get_engine(app=None):
+    """Return the async engine for this app, process and running event loop"""
+    if create_async_engine is None:
+        raise RuntimeError('Async mode needs the packages in requirements-async.txt')
+    app = app or current_app
+    loop = asyncio.get_running_loop()
+    key = (id(app), os.getpid(), id(loop))
+    engine = _engines.get(key)
+    if engine is None:
+        url = app.config.get('ASYNC_DATABASE_URL') or async_url(app.config['SQLALCHEMY_DATABASE_URI'])
+        engine = _engines[key] = create_async_engine(url, **engine_options(app.config, url))
+        if engine.dialect.name == 'sqlite':
+            pragmas = database.connection_pragmas(app.config)
+
+            @event.listens_for(engine.sync_engine, 'connect')
+            def on_connect(dbapi_connection, connection_record):
+                database.apply_sqlite_pragmas(dbapi_connection, pragmas)
+
+        profiling.instrument_engine(app, engine.sync_engine)
+    return engine
+
+
+@asynccontextmanager
+async def session():
+    async with AsyncSession(get_engine(), expire_on_commit=False) as async_session:
+        yield async_session
+
+
+async def _run(statement, result):
+    async with session() as async_session:
+        return result(await async_session.execute(statement))
+
+
+async def gather(*queries):
+    """Run ``(statement, result)`` pairs concurrently, each on its own connection
+
+    ``result`` turns the Result into a value, e.g. ``lambda r: r.scalars().all()``.
+    """
+    return await asyncio.gather(*(_run(statement, result) for statement, result in queries))
+
+
+async def dispose_all():
+    """Close the pools created on the running loop (at server shutdown)"""
+    loop_id = id(asyncio.get_running_loop())
+    for key in [key for key in _engines if key[2] == loop_id]:
+        await _engines.pop(key).dispose()
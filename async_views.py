@@ -0,0 +1,279 @@
+"""
+Async versions of the I/O-heavy views for the async serving mode
+
+``install(app)`` (called by asgi.py) swaps these in for the sync views of
+the same endpoints. Each one is a coroutine that runs on the ASGI server's
+event loop and sends its independent queries concurrently through the
+async engine in async_db.py, so a page waits for its slowest query rather
+than the sum of all of them. Work that stays synchronous (geo lookups in
+the search filters, template rendering, form posts with file uploads) runs
+in a worker thread with ``asyncio.to_thread``.
+
+Flask itself is still WSGI: the rest of the app, and the logged-in user,
+are handled in the request's thread as before. Queries made through the
+async engine always go to the primary database, never the read replica.
+"""
+import asyncio
+import functools
+import uuid
+from datetime import datetime
+
+from flask import abort, current_app, flash, jsonify, redirect, render_template, request, url_for
+from flask_login import current_user, login_required
+from sqlalchemy import delete, func, literal, select
+from sqlalchemy.orm import selectinload
+
+import async_db
+import search_cache
+from blueprints.jobs import RADIUS_OPTIONS_KM, encode_cursor, filter_jobs
+from blueprints.seeker import CLOSED_JOB_MESSAGE
+from database import insert_ignoring_conflicts
+from extensions import db
+from models import Application, Job, SavedJob, User
+
+
+def _scalars(result):
+    return result.scalars().all()
+
+
+def _scalar(result):
+    return result.scalar()
+
+
+def _exists(result):
+    return result.first() is not None
+
+
+def _active_job(job_id):
+    return select(Job).where(Job.id == job_id, Job.deleted_at.is_(None))
+
+
+async def _render(template, **context):
+    return await asyncio.to_thread(render_template, template, **context)
+
+
+async def jobs():
+    # Cursor pages for live filtering are a single query; keep the sync view
+    if request.args.get('format') in ('fragment', 'json'):
+        return await asyncio.to_thread(_sync_view('jobs.jobs'))
+
+    page = max(request.args.get('page', 1, type=int), 1)
+    per_page = 10
+    cache_enabled = current_app.config['SEARCH_CACHE_ENABLED']
+
+    # The cached id list (run in a thread: a miss searches with the sync session)
+    page_ids = None
+    if cache_enabled:
+        entry = await asyncio.to_thread(search_cache.lookup, request.args)
+        page_ids = search_cache.page_ids(entry, page, per_page)
+
+    if page_ids is not None:
+        queries = [(select(Job).where(Job.id.in_(page_ids), Job.status == 'active'), _scalars)]
+    else:
+        if cache_enabled:
+            await asyncio.to_thread(search_cache.check_rate_limit)
+        # Resolving a place name may query the gazetteer tables, so build in a thread
+        statement = await asyncio.to_thread(
+            lambda: filter_jobs(request.args).order_by(Job.created_at.desc(), Job.id.desc()).statement
+        )
+        queries = [
+            (statement.limit(per_page).offset((page - 1) * per_page), _scalars),
+            (select(func.count()).select_from(statement.order_by(None).subquery()), _scalar),
+        ]
+    queries += [
+        (select(Job.job_type).distinct(), _scalars),
+        (select(Job.experience).distinct(), _scalars),
+    ]
+    if current_user.is_authenticated:
+        queries.append((select(SavedJob.job_id).where(SavedJob.user_id == current_user.id), _scalars))
+    results = await async_db.gather(*queries)
+
+    if page_ids is not None:
+        found = {job.id: job for job in results.pop(0)}
+        items = [found[job_id] for job_id in page_ids if job_id in found]
+        total = entry.total
+    else:
+        items, total = results.pop(0), results.pop(0)
+    job_types, experience_levels, *saved = results
+
+    jobs_pagination = search_cache.IdListPagination(items, total, page, per_page)
+    return await _render(
+        'jobs.html',
+        jobs=items,
+        jobs_pagination=jobs_pagination,
+        next_cursor=encode_cursor(items[-1]) if jobs_pagination.has_next else None,
+        search=request.args.get('search', ''),
+        location=request.args.get('location', ''),
+        radius=request.args.get('radius', type=float),
+        radius_options=RADIUS_OPTIONS_KM,
+        remote=request.args.get('remote', ''),
+        job_types=[job_type for job_type in job_types if job_type],
+        experience_levels=[level for level in experience_levels if level],
+        selected_type=request.args.get('type', ''),
+        selected_experience=request.args.get('experience', ''),
+        selected_min_salary=request.args.get('min_salary', type=int),
+        saved_job_ids=saved[0] if saved else []
+    )
+
+
+async def job_detail(job_id):
+    async with async_db.session() as session:
+        job = (await session.execute(_active_job(job_id))).scalar()
+    if job is None:
+        abort(404)
+
+    similar = (select(Job).where(
+        Job.id != job_id,
+        Job.status == 'active',
+        (Job.company == job.company) | (Job.title.ilike(f'%{job.title.split()[0]}%'))
+    ).limit(3), _scalars)
+    has_applied = False
+    is_saved = False
+
+    if current_user.is_authenticated:
+        similar_jobs, has_applied, is_saved = await async_db.gather(
+            similar,
+            (select(Application.id).where(Application.job_id == job_id, Application.user_id == current_user.id), _exists),
+            (select(SavedJob.id).where(SavedJob.job_id == job_id, SavedJob.user_id == current_user.id), _exists),
+        )
+    else:
+        similar_jobs, = await async_db.gather(similar)
+
+    return await _render('job_detail.html', job=job, has_applied=has_applied, is_saved=is_saved, similar_jobs=similar_jobs)
+
+
+async def apply_job(job_id):
+    # Submitting saves an upload and runs one INSERT ... SELECT; keep the sync view
+    if request.method == 'POST':
+        return await asyncio.to_thread(_sync_view('seeker.apply_job'), job_id)
+
+    job, already_applied = await async_db.gather(
+        (_active_job(job_id), _scalar),
+        (select(Application.id).where(Application.job_id == job_id, Application.user_id == current_user.id), _exists),
+    )
+    if job is None:
+        abort(404)
+    if already_applied:
+        flash('You have already applied to this job', 'warning')
+        return redirect(url_for('jobs.job_detail', job_id=job_id))
+    if job.status != 'active':
+        flash(CLOSED_JOB_MESSAGE, 'warning')
+        return redirect(url_for('jobs.job_detail', job_id=job_id))
+
+    return await _render('apply_job.html', job=job, idempotency_key=uuid.uuid4().hex)
+
+
+async def save_job(job_id):
+    wanted = (request.get_json(silent=True) or {}).get('saved')
+
+    async with async_db.session() as session:
+        if wanted is not True:
+            removed = (await session.execute(
+                delete(SavedJob)
+                .where(SavedJob.user_id == current_user.id, SavedJob.job_id == job_id)
+                .returning(SavedJob.id)
+            )).first()
+            await session.commit()
+            if removed is not None or wanted is False:
+                return jsonify({'saved': False, 'message': 'Job removed from saved jobs'}), 200
+
+        saved_id = (await session.execute(
+            insert_ignoring_conflicts(db, SavedJob).from_select(
+                ['user_id', 'job_id', 'saved_at'],
+                select(literal(current_user.id), Job.id, literal(datetime.utcnow()))
+                .where(Job.id == job_id, Job.deleted_at.is_(None)),
+            ).returning(SavedJob.id)
+        )).scalar()
+        await session.commit()
+
+        if saved_id is None and (await session.execute(
+            select(SavedJob.id).where(SavedJob.user_id == current_user.id, SavedJob.job_id == job_id)
+        )).first() is None:
+            abort(404)
+    return jsonify({'saved': True, 'message': 'Job saved successfully'}), 200
+
+
+async def job_seeker_dashboard():
+    if current_user.role != 'job_seeker':
+        return redirect(url_for('auth.dashboard'))
+
+    async with async_db.session() as session:
+        applications = (await session.execute(
+            select(Application)
+            .options(selectinload(Application.job))
+            .where(Application.user_id == current_user.id)
+            .order_by(Application.applied_at.desc())
+        )).scalars().all()
+    return await _render('job_seeker_dashboard.html', applications=applications)
+
+
+async def recruiter_dashboard():
+    if current_user.role != 'recruiter':
+        return redirect(url_for('auth.dashboard'))
+
+    own_jobs = select(Job.id).where(Job.recruiter_id == current_user.id, Job.deleted_at.is_(None))
+    jobs, application_counts = await async_db.gather(
+        (select(Job).where(Job.id.in_(own_jobs)).order_by(Job.created_at.desc()), _scalars),
+        (select(Application.job_id, func.count(Application.id))
+         .where(Application.job_id.in_(own_jobs))
+         .group_by(Application.job_id), lambda result: dict(result.all())),
+    )
+    return await _render('recruiter_dashboard.html', jobs=jobs, application_counts=application_counts)
+
+
+async def admin_dashboard():
+    if current_user.role != 'admin':
+        return redirect(url_for('auth.dashboard'))
+
+    total_users, total_jobs, total_applications, active_jobs, recent_users, recent_jobs = await async_db.gather(
+        (select(func.count(User.id)), _scalar),
+        (select(func.count(Job.id)).where(Job.deleted_at.is_(None)), _scalar),
+        (select(func.count(Application.id)), _scalar),
+        (select(func.count(Job.id)).where(Job.status == 'active'), _scalar),
+        (select(User).order_by(User.created_at.desc()).limit(5), _scalars),
+        (select(Job).where(Job.deleted_at.is_(None)).order_by(Job.created_at.desc()).limit(5), _scalars),
+    )
+    return await _render('admin_dashboard.html',
+                         total_users=total_users,
+                         total_jobs=total_jobs,
+                         total_applications=total_applications,
+                         active_jobs=active_jobs,
+                         recent_users=recent_users,
+                         recent_jobs=recent_jobs)
+
+
+ASYNC_VIEWS = {
+    'jobs.jobs': (jobs, False),
+    'jobs.job_detail': (job_detail, False),
+    'seeker.apply_job': (apply_job, True),
+    'seeker.save_job': (save_job, True),
+    'seeker.job_seeker_dashboard': (job_seeker_dashboard, True),
+    'recruiter.recruiter_dashboard': (recruiter_dashboard, True),
+    'admin.admin_dashboard': (admin_dashboard, True),
+}
+
+def _sync_view(endpoint):
+    return current_app.extensions['async_views'][endpoint]
+
+
+def _load_user_first(view):
+    """Run ``view`` after loading the current user in the request's thread
+
+    The user loader is a sync query; doing it here keeps it off the event loop.
+    """
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        current_user._get_current_object()
+        return current_app.ensure_sync(view)(*args, **kwargs)
+    return wrapper
+
+
+def install(app):
+    """Serve the endpoints in ASYNC_VIEWS with their async versions"""
+    sync_views = app.extensions['async_views'] = {}
+    for endpoint, (view, needs_login) in ASYNC_VIEWS.items():
+        sync_view = sync_views[endpoint] = app.view_functions[endpoint]
+        wrapped = login_required(view) if needs_login else _load_user_first(view)
+        # Keep @read_replica and the other markers the sync view carried
+        wrapped.__dict__.update({name: value for name, value in vars(sync_view).items() if not name.startswith('__')})
+        app.view_functions[endpoint] = wrapped
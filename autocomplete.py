@@ -0,0 +1,357 @@
+"""
+Typeahead suggestions for job search and location inputs
+
+Titles, companies, skills and locations of active jobs are kept in an
+in-memory sorted array of lowercase keys, one entry per word start, so
+"eng" finds "Senior Software Engineer". A lookup is a bisect to the first
+key with the prefix, and suggestions are ranked by how many active jobs use
+the term. Ranks live in a segment tree beside the keys, so even a
+one-letter prefix that matches most of the index costs a handful of tree
+lookups, not a scan.
+
+An index is never changed in place. Each worker builds one on a background
+thread that starts with the worker's first request, and the thread swaps in
+a new index whole, so lookups never wait on a build or see one half done
+(they get no suggestions until the first build finishes). After this
+worker's own job writes (the ``jobs_changed`` signal) and every
+``AUTOCOMPLETE_REFRESH_SECONDS`` (for jobs other workers have created) the
+thread re-reads only the affected jobs and applies them to a copy of the
+index. A full rebuild every ``AUTOCOMPLETE_REBUILD_SECONDS`` is the safety
+net for other workers' edits and deletions.
+"""
+import bisect
+import copy
+import heapq
+import threading
+import time
+from collections import Counter, namedtuple
+
+from flask import current_app, has_app_context
+from background import BackgroundThread
+from extensions import db
+from models import Job
+from signals import jobs_changed
+
+SEARCH_KINDS = ('title', 'company', 'skill')
+LOCATION_KINDS = ('location',)
+_MAX_CHAR = chr(0x10FFFF)  # sorts after any character a search key can continue with
+_ID_CHUNK_SIZE = 500
+
+
+def job_terms(title, company, skills, location):
+    """Return the (kind, text) terms a job contributes to the index"""
+    terms = []
+    for kind, text in (('title', title), ('company', company), ('location', location)):
+        if text and text.strip():
+            terms.append((kind, text.strip()))
+    for skill in (skills or '').split(','):
+        if skill.strip():
+            terms.append(('skill', skill.strip()))
+    return terms
+
+
+def _search_keys(key):
+    """Every suffix of ``key`` that starts at a word boundary"""
+    keys = [key]
+    for i, char in enumerate(key):
+        if char in ' -/(' and i + 1 < len(key) and key[i + 1] not in ' -/(':
+            keys.append(key[i + 1:])
+    return keys
+
+
+class _RangeMin:
+    """Position of the smallest value in any slice of a list (a segment tree)
+
+    ``set()`` replaces one value in O(log n); ``copy()`` gives a tree that
+    can be changed without affecting this one.
+    """
+
+    def __init__(self, values):
+        size = self._size = len(values)
+        self.values = values
+        tree = [0] * size + list(range(size))
+        for i in range(size - 1, 0, -1):
+            left, right = tree[2 * i], tree[2 * i + 1]
+            tree[i] = left if values[left] <= values[right] else right
+        self._tree = tree
+
+    def copy(self):
+        other = _RangeMin.__new__(_RangeMin)
+        other._size, other.values, other._tree = self._size, list(self.values), list(self._tree)
+        return other
+
+    def set(self, i, value):
+        values, tree = self.values, self._tree
+        values[i] = value
+        i = (i + self._size) >> 1
+        while i:
+            left, right = tree[2 * i], tree[2 * i + 1]
+            tree[i] = left if values[left] <= values[right] else right
+            i >>= 1
+
+    def argmin(self, lo, hi):
+        values, tree = self.values, self._tree
+        best = None
+        lo += self._size
+        hi += self._size
+        while lo < hi:
+            if lo & 1:
+                if best is None or values[tree[lo]] < values[best]:
+                    best = tree[lo]
+                lo += 1
+            if hi & 1:
+                hi -= 1
+                if best is None or values[tree[hi]] < values[best]:
+                    best = tree[hi]
+            lo >>= 1
+            hi >>= 1
+        return best
+
+
+# keys: sorted search keys; ranks: range-minimum tree over their terms' ranks;
+# positions: term -> indexes of its keys; extra: sorted (search key, term)
+# pairs for terms added by updated() since the index was built
+_Group = namedtuple('_Group', 'keys ranks positions extra')
+
+
+class PrefixIndex:
+    """Frequency-ranked prefix index over job terms
+
+    ``jobs`` yields (job id, terms) pairs. A term's rank is (-number of jobs
+    using it, length, text), and each group of kinds keeps its sorted search
+    keys with a range-minimum tree over their ranks. The keys with a given
+    prefix are one slice of that list, so the best ``limit`` terms come out in
+    O(limit * log n) however common the prefix is.
+
+    An index is never changed in place. ``updated()`` returns a copy with
+    some jobs' terms replaced: the ranks of the terms they touch are reset in
+    O(log n) each, and terms the index has not seen go in a short sorted list
+    of their own until the next full build.
+    """
+
+    def __init__(self, jobs=()):
+        self._job_terms = {}    # job id -> (kind, key) terms it contributes
+        self._counts = Counter()  # (kind, key) -> number of active jobs using the term
+        self._display = {}      # (kind, key) -> text as first seen
+        for job_id, terms in jobs:
+            self._add_job(job_id, terms)
+
+        self._groups = {}
+        for kinds in (SEARCH_KINDS, LOCATION_KINDS):
+            # Collected and sorted once: inserting entries one by one is quadratic
+            entries = sorted(
+                (search_key, self._rank(term))
+                for term in self._counts if term[0] in kinds
+                for search_key in _search_keys(term[1])
+            )
+            positions = {}
+            for i, (_, (_, _, key, kind)) in enumerate(entries):
+                positions.setdefault((kind, key), []).append(i)
+            self._groups[kinds] = _Group(
+                [key for key, _ in entries], _RangeMin([rank for _, rank in entries]), positions, []
+            )
+        self.max_job_id = max(self._job_terms, default=0)
+        self.built_at = time.monotonic()
+
+    def __len__(self):
+        return len(self._counts)
+
+    def _rank(self, term):
+        kind, key = term
+        return (-self._counts.get(term, 0), len(key), key, kind)
+
+    def _add_job(self, job_id, terms):
+        keys = {}
+        for kind, text in terms:
+            keys.setdefault((kind, text.lower()), text)
+        for term, text in keys.items():
+            self._counts[term] += 1
+            self._display.setdefault(term, text)
+        self._job_terms[job_id] = tuple(keys)
+        return keys
+
+    def updated(self, changes):
+        """Return a copy with ``changes`` (job id -> terms, or None to drop the job) applied"""
+        index = copy.copy(self)
+        index._job_terms = dict(self._job_terms)
+        index._counts = self._counts.copy()
+        index._display = dict(self._display)
+        touched = set()
+        for job_id, terms in changes.items():
+            for term in index._job_terms.pop(job_id, ()):
+                index._counts[term] -= 1
+                if not index._counts[term]:
+                    del index._counts[term]
+                touched.add(term)
+            if terms is not None:
+                touched.update(index._add_job(job_id, terms))
+                index.max_job_id = max(index.max_job_id, job_id)
+        index._groups = {
+            kinds: index._updated_group(group, [term for term in touched if term[0] in kinds])
+            for kinds, group in self._groups.items()
+        }
+        return index
+
+    def _updated_group(self, group, terms):
+        if not terms:
+            return group
+        ranks, extra = group.ranks.copy(), None
+        for term in terms:
+            if term in group.positions:
+                rank = self._rank(term)
+                for i in group.positions[term]:
+                    ranks.set(i, rank)
+                continue
+            if term not in self._counts:
+                continue  # added and dropped again since the index was built
+            if extra is None:
+                extra = list(group.extra)
+            entry = (term[1], term)  # a term's whole key is always one of its search keys
+            i = bisect.bisect_left(extra, entry)
+            if i == len(extra) or extra[i] != entry:
+                for search_key in _search_keys(term[1]):
+                    bisect.insort(extra, (search_key, term))
+        return group._replace(ranks=ranks, extra=group.extra if extra is None else extra)
+
+    def lookup(self, prefix, kinds, limit=10):
+        """Return up to ``limit`` suggestions whose words start with ``prefix``"""
+        prefix = prefix.strip().lower()
+        if not prefix:
+            return []
+
+        group = self._groups[kinds]
+        keys, ranks = group.keys, group.ranks
+        heap = []
+
+        def push(lo, hi):
+            if lo < hi:
+                i = ranks.argmin(lo, hi)
+                heapq.heappush(heap, (ranks.values[i], i, lo, hi))
+
+        # Best remaining rank in each unexplored part of the prefix's slice
+        push(bisect.bisect_left(keys, prefix), bisect.bisect_left(keys, prefix + _MAX_CHAR))
+        found = []
+        while heap and len(found) < limit:
+            rank, i, lo, hi = heapq.heappop(heap)
+            if not rank[0]:
+                break  # only terms no active job uses any more are left
+            if rank not in found:  # a term can match at two of its word starts
+                found.append(rank)
+            push(lo, i)
+            push(i + 1, hi)
+
+        if group.extra:
+            extra = group.extra
+            lo = bisect.bisect_left(extra, (prefix,))
+            hi = bisect.bisect_left(extra, (prefix + _MAX_CHAR,))
+            for _, term in extra[lo:hi]:
+                rank = self._rank(term)
+                if rank[0] and rank not in found:
+                    found.append(rank)
+            found = sorted(found)[:limit]
+        return [
+            {'text': self._display[(kind, key)], 'kind': kind, 'count': -count} for count, _, key, kind in found
+        ]
+
+
+def _active_job_rows(*criteria):
+    return db.session.query(Job.id, Job.title, Job.company, Job.skills, Job.location).filter(
+        Job.status == 'active', *criteria
+    )
+
+
+def build_index():
+    rows = _active_job_rows().yield_per(1000)
+    return PrefixIndex(
+        (job_id, job_terms(title, company, skills, location)) for job_id, title, company, skills, location in rows
+    )
+
+
+def index_changes(index, job_ids):
+    """Changes for ``PrefixIndex.updated()``: the given jobs and any newer than the index
+
+    Jobs that no longer exist or are not active map to None.
+    """
+    changes = dict.fromkeys(job_ids)
+    ids = sorted(job_ids)
+    queries = [_active_job_rows(Job.id > index.max_job_id)]
+    queries += [_active_job_rows(Job.id.in_(ids[i:i + _ID_CHUNK_SIZE])) for i in range(0, len(ids), _ID_CHUNK_SIZE)]
+    for query in queries:
+        for job_id, title, company, skills, location in query:
+            changes[job_id] = job_terms(title, company, skills, location)
+    return changes
+
+
+class IndexBuilder(BackgroundThread):
+    """Per-process daemon thread that builds and updates indexes and swaps them in"""
+
+    name = 'autocomplete-index'
+
+    def __init__(self, app):
+        super().__init__(app)
+        self.index = None
+        self._changed = threading.Event()
+        self._pending_lock = threading.Lock()
+        self._pending = set()
+
+    def changed(self, job_ids):
+        """Queue jobs written in this process for the next update"""
+        with self._pending_lock:
+            self._pending.update(job_ids)
+        self._changed.set()
+
+    def starting(self):
+        # Keep serving an index inherited across a fork until this process updates it
+        self._changed = threading.Event()
+        self._pending_lock = threading.Lock()
+        self._pending = set()
+
+    def run(self):
+        while True:
+            self._changed.clear()
+            self.call(self._update, failure='Updating the autocomplete index failed')
+            self._changed.wait(self.app.config['AUTOCOMPLETE_REFRESH_SECONDS'])
+
+    def _update(self):
+        with self._pending_lock:
+            job_ids = set(self._pending)
+        started = time.perf_counter()
+        index = self.index
+        if index is None or time.monotonic() - index.built_at > self.app.config['AUTOCOMPLETE_REBUILD_SECONDS']:
+            self.index = build_index()
+            self.app.logger.debug(
+                'Autocomplete index: %d terms in %.0f ms', len(self.index), (time.perf_counter() - started) * 1000
+            )
+        else:
+            changes = index_changes(index, job_ids)
+            if changes:
+                self.index = index.updated(changes)
+                self.app.logger.debug(
+                    'Autocomplete index: %d jobs updated in %.0f ms',
+                    len(changes), (time.perf_counter() - started) * 1000,
+                )
+        # Left queued if anything above raised, so the next update retries them
+        with self._pending_lock:
+            self._pending -= job_ids
+
+
+_EMPTY_INDEX = PrefixIndex()
+
+
+def get_index(app=None):
+    """Return this worker's current index (empty until the first build is done)"""
+    builder = (app or current_app).extensions['autocomplete']
+    builder.ensure_started()
+    return builder.index or _EMPTY_INDEX
+
+
+@jobs_changed.connect
+def _on_jobs_changed(sender, job_ids=None, **extra):
+    if has_app_context() and 'autocomplete' in current_app.extensions:
+        current_app.extensions['autocomplete'].changed(job_ids or ())
+
+
+def init_app(app):
+    builder = app.extensions['autocomplete'] = IndexBuilder(app)
+    # Start building with the worker's first request, before anyone types
+    builder.start_before_requests()
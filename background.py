@@ -0,0 +1,58 @@
+"""
+Per-process background threads
+
+Features that do periodic or queued work (job purging, the job sweeper,
+search cache warming) run it on a daemon thread in each worker process.
+Threads don't survive a fork, so a thread started before gunicorn's
+``--preload`` fork would be missing from every worker. ``ensure_started()``
+remembers the pid it started in and starts a fresh thread in any other
+process; features call it on first use or from a before_request hook.
+"""
+import os
+import threading
+
+from extensions import db
+
+
+class BackgroundThread:
+    """Base class for a daemon thread started once per process
+
+    Subclasses set ``name`` and implement ``run()``; ``starting()`` can reset
+    per-process state (such as a queue) before the thread starts.
+    """
+
+    name = 'background'
+
+    def __init__(self, app):
+        self.app = app
+        self._lock = threading.Lock()
+        self._pid = None
+
+    def ensure_started(self):
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self.starting()
+            self._pid = os.getpid()
+            threading.Thread(target=self.run, name=self.name, daemon=True).start()
+
+    def start_before_requests(self):
+        """Start the thread in each process when it serves its first request"""
+        self.app.before_request(self.ensure_started)
+
+    def starting(self):
+        pass
+
+    def run(self):
+        raise NotImplementedError
+
+    def call(self, func, *args, failure='Background task failed'):
+        """Run ``func(*args)`` in an app context; log and roll back if it raises"""
+        with self.app.app_context():
+            try:
+                return func(*args)
+            except Exception:
+                db.session.rollback()
+                self.app.logger.exception(failure)
@@ -0,0 +1,93 @@
+"""
+Benchmark response compression CPU cost against bytes saved
+
+Renders the main pages of a seeded Job Portal, then compresses each body
+with gzip and brotli at several levels and reports the compressed size,
+savings and CPU time per response.
+
+Usage:
+    python benchmarks/compression.py --jobs 500 --repeat 20
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import compression  # noqa: E402
+
+ROUTES = ('/', '/jobs', '/jobs?search=engineer', '/job/1', '/admin/users', '/admin/jobs')
+
+CODECS = [('gzip', level) for level in (1, 6, 9)] + [('br', quality) for quality in (1, 4, 11)]
+
+
+def render_pages(jobs):
+    from app import create_app
+    from commands import init_db
+    from models import db, Job, User
+
+    app = create_app()
+    app.config['COMPRESS_ENABLED'] = False
+    with app.app_context():
+        init_db()
+        recruiter = User(username='recruiter', email='recruiter@example.com', role='recruiter', full_name='Recruiter')
+        recruiter.set_password('recruiter123')
+        db.session.add(recruiter)
+        db.session.commit()
+        now = datetime.utcnow()
+        db.session.execute(db.insert(Job), [
+            {
+                'title': f'Software Engineer {i}', 'company': f'Company {i % 40}',
+                'location': ('Remote', 'Austin, TX', 'New York, NY')[i % 3],
+                'job_type': 'full-time', 'experience': '3-5 years', 'salary': '$120,000 - $150,000',
+                'skills': 'Python, Flask, PostgreSQL, Docker, AWS',
+                'description': 'Build and scale the systems that power our platform. ' * 8,
+                'status': 'active', 'recruiter_id': recruiter.id, 'created_at': now,
+            }
+            for i in range(jobs)
+        ])
+        db.session.commit()
+
+    client = app.test_client()
+    client.post('/login', data={'email': 'admin@jobportal.com', 'password': 'admin123'})
+    pages = {}
+    for route in ROUTES:
+        response = client.get(route, headers={'Accept-Encoding': 'identity'})
+        pages[route] = response.get_data()
+    return pages
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--jobs', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tmp, 'compression.db')}"
+        pages = render_pages(args.jobs)
+
+    codecs = [(name, level) for name, level in CODECS if name != 'br' or compression.brotli is not None]
+    if len(codecs) < len(CODECS):
+        print('brotli not installed; showing gzip only (pip install brotli)')
+
+    print(f"{'route':<24} {'codec':<8} {'raw KB':>8} {'out KB':>8} {'saved':>7} {'cpu ms':>8}")
+    for route, body in pages.items():
+        for name, level in codecs:
+            app_config = {'COMPRESS_LEVEL': level, 'COMPRESS_BR_QUALITY': level}
+            started = time.perf_counter()
+            for _ in range(args.repeat):
+                compressed = compression.compress_body(app_config, name, body)
+            cpu_ms = (time.perf_counter() - started) * 1000 / args.repeat
+            saved = 1 - len(compressed) / len(body) if body else 0
+            print(
+                f'{route:<24} {name + "-" + str(level):<8} {len(body) / 1024:>8.1f} '
+                f'{len(compressed) / 1024:>8.1f} {saved:>7.1%} {cpu_ms:>8.2f}'
+            )
+
+
+if __name__ == '__main__':
+    main()
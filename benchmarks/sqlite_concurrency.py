@@ -0,0 +1,177 @@
+"""
+Benchmark SQLite read/write concurrency across worker processes
+
+Runs the same mixed workload (job listing reads plus application inserts)
+from several processes against a fresh database file, once with SQLite's
+default rollback journal and once with the SQLITE_PERFORMANCE_MODE profile,
+and reports throughput, latency and "database is locked" errors.
+
+Usage:
+    python benchmarks/sqlite_concurrency.py --workers 4 --seconds 5
+"""
+import argparse
+import multiprocessing
+import os
+import queue
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, event, func, insert, select  # noqa: E402
+from sqlalchemy.exc import OperationalError  # noqa: E402
+
+import database  # noqa: E402
+from models import db, Application, Job, User  # noqa: E402
+from config import Config  # noqa: E402
+
+PROFILE_CONFIG = {
+    'SQLITE_BUSY_TIMEOUT_MS': Config.SQLITE_BUSY_TIMEOUT_MS,
+    'SQLITE_MMAP_SIZE': Config.SQLITE_MMAP_SIZE,
+    'SQLITE_CACHE_SIZE': Config.SQLITE_CACHE_SIZE,
+}
+
+
+def make_engine(path, performance):
+    # pysqlite waits up to `timeout` seconds on a lock; keep the default
+    # mode's timeout equal to the profile's busy timeout for a fair comparison
+    timeout = PROFILE_CONFIG['SQLITE_BUSY_TIMEOUT_MS'] / 1000
+    engine = create_engine(f'sqlite:///{path}', connect_args={'timeout': timeout})
+    if performance:
+        pragmas = database.sqlite_pragmas(PROFILE_CONFIG)
+
+        @event.listens_for(engine, 'connect')
+        def on_connect(dbapi_connection, connection_record):
+            database.apply_sqlite_pragmas(dbapi_connection, pragmas)
+
+    return engine
+
+
+def seed(path, performance, jobs):
+    engine = make_engine(path, performance)
+    db.metadata.create_all(engine)
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        conn.execute(insert(User.__table__), [
+            {'username': 'recruiter', 'email': 'r@example.com', 'password_hash': 'x', 'role': 'recruiter', 'created_at': now},
+            {'username': 'seeker', 'email': 's@example.com', 'password_hash': 'x', 'role': 'job_seeker', 'created_at': now},
+        ])
+        conn.execute(insert(Job.__table__), [
+            {
+                'title': f'Engineer {i}', 'company': f'Company {i % 50}', 'location': 'Remote',
+                'description': 'Build things ' * 40, 'status': 'active', 'recruiter_id': 1,
+                'created_at': now,
+            }
+            for i in range(jobs)
+        ])
+    engine.dispose()
+
+
+def worker(index, path, performance, seconds, write_ratio, jobs, workers, results):
+    engine = make_engine(path, performance)
+    jobs_table = Job.__table__
+    applications = Application.__table__
+    rng = random.Random(os.getpid())
+    read_latencies, write_latencies = [], []
+    locked = 0
+    writes = 0
+
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        is_write = rng.random() < write_ratio
+        start = time.perf_counter()
+        try:
+            if is_write:
+                # Every write is a real row: a (job_id, user_id) pair no other
+                # write uses, since a duplicate would be a cheap no-op insert.
+                # Foreign keys are off, so the applicants need not exist.
+                with engine.begin() as conn:
+                    conn.execute(insert(applications).values(
+                        job_id=rng.randint(1, jobs), user_id=3 + index + writes * workers, cover_letter='Hello ' * 50,
+                        status='pending', applied_at=datetime.utcnow(), updated_at=datetime.utcnow(),
+                    ))
+                writes += 1
+            else:
+                with engine.connect() as conn:
+                    conn.execute(
+                        select(jobs_table).where(jobs_table.c.status == 'active')
+                        .order_by(jobs_table.c.created_at.desc()).limit(10)
+                    ).all()
+                    conn.execute(select(func.count()).select_from(applications)).scalar()
+        except OperationalError as e:
+            if 'locked' not in str(e):
+                raise
+            locked += 1
+            continue
+        elapsed = time.perf_counter() - start
+        (write_latencies if is_write else read_latencies).append(elapsed)
+
+    engine.dispose()
+    results.put((read_latencies, write_latencies, locked))
+
+
+def run(performance, args):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'bench.db')
+        seed(path, performance, args.jobs)
+
+        results = multiprocessing.Queue()
+        procs = [
+            multiprocessing.Process(
+                target=worker,
+                args=(index, path, performance, args.seconds, args.write_ratio, args.jobs, args.workers, results),
+            )
+            for index in range(args.workers)
+        ]
+        for p in procs:
+            p.start()
+        collected = []
+        while len(collected) < len(procs):
+            try:
+                collected.append(results.get(timeout=1))
+            except queue.Empty:
+                # A worker that died never reports; don't wait for it forever
+                failed = [p.exitcode for p in procs if p.exitcode not in (None, 0)]
+                if failed:
+                    for p in procs:
+                        p.terminate()
+                    raise RuntimeError(f'{len(failed)} benchmark worker(s) failed, exit codes {failed}')
+        for p in procs:
+            p.join()
+
+    reads = [lat for r, _, _ in collected for lat in r]
+    writes = [lat for _, w, _ in collected for lat in w]
+    locked = sum(l for _, _, l in collected)
+    return reads, writes, locked
+
+
+def p95(values):
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=20)[-1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--seconds', type=float, default=5.0)
+    parser.add_argument('--write-ratio', type=float, default=0.2)
+    parser.add_argument('--jobs', type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f'{args.workers} workers, {args.seconds}s, {args.write_ratio:.0%} writes, {args.jobs} jobs')
+    print(f"{'mode':<12} {'reads/s':>10} {'writes/s':>10} {'read p95 ms':>12} {'write p95 ms':>13} {'locked':>8}")
+    for label, performance in (('default', False), ('performance', True)):
+        reads, writes, locked = run(performance, args)
+        print(
+            f'{label:<12} {len(reads) / args.seconds:>10.0f} {len(writes) / args.seconds:>10.0f} '
+            f'{p95(reads) * 1000:>12.2f} {p95(writes) * 1000:>13.2f} {locked:>8}'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""
+Measure cold-start time of the Job Portal application
+
+Each run starts a fresh Python process (like a newly forked gunicorn worker
+without --preload) and records how long it takes to import the app, build it
+with create_app() and serve the first request to a few pages. The database is
+created once up front so schema creation is not part of the measurement.
+
+Usage:
+    python benchmarks/startup_time.py --runs 10
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = r'''
+import json, sys, time
+started = time.perf_counter()
+import app as app_module
+imported = time.perf_counter()
+app = app_module.app
+client = app.test_client()
+first_request = {}
+for path in sys.argv[1:]:
+    t = time.perf_counter()
+    client.get(path)
+    first_request[path] = (time.perf_counter() - t) * 1000
+print(json.dumps({
+    'import_ms': (imported - started) * 1000,
+    'startup_metrics': app.extensions.get('startup_metrics', {}),
+    'first_request_ms': first_request,
+}))
+'''
+
+PATHS = ('/', '/jobs', '/login')
+
+
+def run_probe(env):
+    output = subprocess.run(
+        [sys.executable, '-c', PROBE, *PATHS],
+        cwd=ROOT, env=env, check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, DATABASE_URL=f"sqlite:///{os.path.join(tmp, 'startup.db')}")
+        subprocess.run(
+            [sys.executable, '-m', 'flask', '--app', 'app', 'init-db'],
+            cwd=ROOT, env=env, check=True, capture_output=True,
+        )
+        samples = [run_probe(env) for _ in range(args.runs)]
+
+    rows = {'import app (ms)': [s['import_ms'] for s in samples]}
+    for key in samples[0]['startup_metrics']:
+        rows[f'{key}'] = [s['startup_metrics'][key] for s in samples]
+    for path in PATHS:
+        rows[f'first GET {path} (ms)'] = [s['first_request_ms'][path] for s in samples]
+
+    print(f'{args.runs} cold starts')
+    print(f"{'metric':<28} {'median':>9} {'min':>9} {'max':>9}")
+    for label, values in rows.items():
+        print(f'{label:<28} {statistics.median(values):>9.1f} {min(values):>9.1f} {max(values):>9.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,6 @@
+"""
+Route blueprints for Job Portal
+"""
+from blueprints import admin, auth, jobs, recruiter, seeker
+
+BLUEPRINTS = (auth.bp, jobs.bp, seeker.bp, recruiter.bp, admin.bp)
@@ -0,0 +1,119 @@
+"""
+Admin routes: platform statistics and oversight of users and jobs
+"""
+from flask import Blueprint, Response, render_template, redirect, request, url_for, flash
+from flask_login import login_required, current_user
+
+import job_archive
+import profiling
+from database import read_replica
+from extensions import db
+from models import ArchivedJob, RequestProfile, User, Job, Application
+
+bp = Blueprint('admin', __name__)
+
+@bp.route('/admin/dashboard')
+@read_replica
+@login_required
+def admin_dashboard():
+    if current_user.role != 'admin':
+        return redirect(url_for('auth.dashboard'))
+    
+    total_users = User.query.count()
+    total_jobs = Job.query.filter_by(deleted_at=None).count()
+    total_applications = Application.query.count()
+    active_jobs = Job.query.filter_by(status='active').count()
+    
+    recent_users = User.query.order_by(User.created_at.desc()).limit(5).all()
+    recent_jobs = Job.query.filter_by(deleted_at=None).order_by(Job.created_at.desc()).limit(5).all()
+    
+    return render_template('admin_dashboard.html', 
+                         total_users=total_users,
+                         total_jobs=total_jobs,
+                         total_applications=total_applications,
+                         active_jobs=active_jobs,
+                         recent_users=recent_users,
+                         recent_jobs=recent_jobs)
+
+@bp.route('/admin/users')
+@read_replica
+@login_required
+def admin_users():
+    if current_user.role != 'admin':
+        flash('Unauthorized access', 'error')
+        return redirect(url_for('auth.dashboard'))
+    
+    users = User.query.order_by(User.created_at.desc()).all()
+    return render_template('admin_users.html', users=users)
+
+@bp.route('/admin/jobs')
+@read_replica
+@login_required
+def admin_jobs():
+    if current_user.role != 'admin':
+        flash('Unauthorized access', 'error')
+        return redirect(url_for('auth.dashboard'))
+    
+    jobs = Job.query.filter_by(deleted_at=None).order_by(Job.created_at.desc()).all()
+    return render_template('admin_jobs.html', jobs=jobs)
+
+@bp.route('/admin/archive')
+@read_replica
+@login_required
+def admin_archive():
+    if current_user.role != 'admin':
+        flash('Unauthorized access', 'error')
+        return redirect(url_for('auth.dashboard'))
+    
+    page = request.args.get('page', 1, type=int)
+    jobs_pagination = ArchivedJob.query.options(db.joinedload(ArchivedJob.recruiter)).order_by(
+        ArchivedJob.archived_at.desc(), ArchivedJob.id.desc()
+    ).paginate(page=page, per_page=50, error_out=False)
+    return render_template(
+        'archived_jobs.html',
+        jobs_pagination=jobs_pagination,
+        application_counts=job_archive.application_counts(jobs_pagination.items),
+        endpoint='admin.admin_archive',
+        back_url=url_for('admin.admin_dashboard'),
+    )
+
+@bp.route('/admin/profiles')
+@login_required
+def admin_profiles():
+    if current_user.role != 'admin':
+        flash('Unauthorized access', 'error')
+        return redirect(url_for('auth.dashboard'))
+    
+    page = request.args.get('page', 1, type=int)
+    profiles_pagination = RequestProfile.query.options(
+        db.defer(RequestProfile.stacks), db.defer(RequestProfile.queries)
+    ).order_by(RequestProfile.id.desc()).paginate(page=page, per_page=50, error_out=False)
+    return render_template('admin_profiles.html', profiles_pagination=profiles_pagination)
+
+@bp.route('/admin/profiles/<int:profile_id>')
+@login_required
+def admin_profile(profile_id):
+    if current_user.role != 'admin':
+        flash('Unauthorized access', 'error')
+        return redirect(url_for('auth.dashboard'))
+    
+    profile = RequestProfile.query.get_or_404(profile_id)
+    return render_template(
+        'admin_profile.html',
+        profile=profile,
+        hot_frames=profiling.hot_frames(profile.stacks or ''),
+        queries=profiling.query_summary(profile.queries),
+    )
+
+@bp.route('/admin/profiles/<int:profile_id>/stacks.txt')
+@login_required
+def admin_profile_stacks(profile_id):
+    if current_user.role != 'admin':
+        flash('Unauthorized access', 'error')
+        return redirect(url_for('auth.dashboard'))
+    
+    profile = RequestProfile.query.get_or_404(profile_id)
+    # Collapsed stacks for flamegraph.pl or https://www.speedscope.app
+    return Response(profile.stacks or '', mimetype='text/plain', headers={
+        'Content-Disposition': f'attachment; filename=profile-{profile.id}.collapsed.txt',
+    })
@@ -0,0 +1,97 @@
+"""
+Authentication routes: login, registration and the role-based dashboard redirect
+"""
+from flask import Blueprint, render_template, redirect, url_for, flash, request
+from flask_login import login_user, logout_user, login_required, current_user
+
+from extensions import db
+from models import User
+
+bp = Blueprint('auth', __name__)
+
+@bp.route('/login', methods=['GET', 'POST'])
+def login():
+    if current_user.is_authenticated:
+        return redirect(url_for('auth.dashboard'))
+    
+    if request.method == 'POST':
+        email = request.form.get('email', '').strip().lower()
+        password = request.form.get('password')
+        remember = request.form.get('remember', False)
+        
+        if not email or not password:
+            flash('Please provide email and password', 'error')
+        else:
+            user = User.query.filter_by(email=email).first()
+            
+            if user and user.check_password(password):
+                login_user(user, remember=remember)
+                next_page = request.args.get('next')
+                flash(f'Welcome back, {user.full_name or user.username}!', 'success')
+                return redirect(next_page or url_for('auth.dashboard'))
+            else:
+                flash('Invalid email or password', 'error')
+    
+    return render_template('login.html')
+
+@bp.route('/register', methods=['GET', 'POST'])
+def register():
+    if current_user.is_authenticated:
+        return redirect(url_for('auth.dashboard'))
+    
+    if request.method == 'POST':
+        username = request.form.get('username', '').strip()
+        email = request.form.get('email', '').strip().lower()
+        password = request.form.get('password')
+        confirm_password = request.form.get('confirm_password')
+        full_name = request.form.get('full_name', '').strip()
+        phone = request.form.get('phone', '').strip()
+        role = request.form.get('role')
+        
+        # Validation
+        errors = []
+        if not username or len(username) < 3:
+            errors.append('Username must be at least 3 characters')
+        if not email or '@' not in email:
+            errors.append('Valid email is required')
+        if not password or len(password) < 6:
+            errors.append('Password must be at least 6 characters')
+        if password != confirm_password:
+            errors.append('Passwords do not match')
+        if not full_name:
+            errors.append('Full name is required')
+        if not role or role not in ['job_seeker', 'recruiter']:
+            errors.append('Please select a valid role')
+        
+        if errors:
+            for error in errors:
+                flash(error, 'error')
+        elif User.query.filter_by(email=email).first():
+            flash('Email already registered', 'error')
+        elif User.query.filter_by(username=username).first():
+            flash('Username already taken', 'error')
+        else:
+            user = User(username=username, email=email, full_name=full_name, phone=phone, role=role)
+            user.set_password(password)
+            db.session.add(user)
+            db.session.commit()
+            flash('Registration successful! Please login.', 'success')
+            return redirect(url_for('auth.login'))
+    
+    return render_template('register.html')
+
+@bp.route('/logout')
+@login_required
+def logout():
+    logout_user()
+    return redirect(url_for('jobs.index'))
+
+@bp.route('/dashboard')
+@login_required
+def dashboard():
+    if current_user.role == 'admin':
+        return redirect(url_for('admin.admin_dashboard'))
+    elif current_user.role == 'recruiter':
+        return redirect(url_for('recruiter.recruiter_dashboard'))
+    else:
+        return redirect(url_for('seeker.job_seeker_dashboard'))
@@ -0,0 +1,212 @@
+"""
+Public job browsing routes
+"""
+from datetime import datetime
+
+from flask import Blueprint, abort, current_app, jsonify, make_response, render_template, request, url_for
+from flask_login import current_user
+
+import autocomplete
+import geo
+import search_cache
+from database import read_replica
+from extensions import db
+from models import Job, Location, SavedJob, Application, get_job_or_404
+
+bp = Blueprint('jobs', __name__)
+
+RADIUS_OPTIONS_KM = (10, 25, 50, 100, 250)
+
+@bp.route('/')
+@read_replica
+def index():
+    recent_jobs = Job.query.filter_by(status='active').order_by(Job.created_at.desc()).limit(6).all()
+    return render_template('index.html', recent_jobs=recent_jobs)
+
+def filter_jobs(args):
+    """Build the active-jobs query for the filters in ``args``"""
+    search = args.get('search', '')
+    location = args.get('location', '')
+    job_type = args.get('type', '')
+    experience = args.get('experience', '')
+    min_salary = args.get('min_salary', type=int)
+    radius = args.get('radius', type=float)
+    remote = args.get('remote', '')
+    
+    # Start with base query
+    query = Job.query.filter_by(status='active')
+    
+    # Apply filters
+    if search:
+        query = query.filter(
+            (Job.title.ilike(f'%{search}%')) |
+            (Job.skills.ilike(f'%{search}%')) |
+            (Job.description.ilike(f'%{search}%')) |
+            (Job.company.ilike(f'%{search}%'))
+        )
+    
+    if location:
+        # Known places match by normalized location (so "SF" finds
+        # "San Francisco, CA") or by distance; anything else by text
+        place = geo.get_gazetteer().resolve(location)
+        if place is not None and radius:
+            location_ids = geo.location_ids_within(place.latitude, place.longitude, radius)
+            query = query.filter(Job.location_id.in_(location_ids))
+        elif place is not None:
+            location_ids = geo.location_ids_for_place(place)
+            query = query.filter(Job.location_id.in_(location_ids) | Job.location.ilike(f'%{location}%'))
+        else:
+            query = query.filter(Job.location.ilike(f'%{location}%'))
+    
+    if remote == 'only':
+        query = query.filter(Job.location_id.in_(db.select(Location.id).where(Location.is_remote)))
+        
+    if job_type and job_type != 'all':
+        query = query.filter(Job.job_type == job_type)
+        
+    if experience and experience != 'all':
+        query = query.filter(Job.experience == experience)
+        
+    if min_salary:
+        query = query.filter(Job.salary.isnot(None))
+    
+    return query
+
+def encode_cursor(job):
+    return f'{job.created_at.isoformat()}_{job.id}'
+
+def decode_cursor(cursor):
+    try:
+        created_at, job_id = cursor.rsplit('_', 1)
+        return datetime.fromisoformat(created_at), int(job_id)
+    except ValueError:
+        abort(400)
+
+def job_summary(job):
+    return {
+        'id': job.id,
+        'title': job.title,
+        'company': job.company,
+        'location': job.location,
+        'job_type': job.job_type,
+        'experience': job.experience,
+        'salary': job.salary,
+        'created_at': job.created_at.isoformat(),
+        'url': url_for('jobs.job_detail', job_id=job.id),
+    }
+
+@bp.route('/jobs')
+@read_replica
+def jobs():
+    # Get search parameters
+    search = request.args.get('search', '')
+    location = request.args.get('location', '')
+    job_type = request.args.get('type', '')
+    experience = request.args.get('experience', '')
+    min_salary = request.args.get('min_salary', type=int)
+    radius = request.args.get('radius', type=float)
+    remote = request.args.get('remote', '')
+    
+    # Pagination
+    page = request.args.get('page', 1, type=int)
+    per_page = 10
+    
+    # Fragment mode: only the result cards (or compact JSON) for live filtering
+    # and infinite scroll, paged by a (created_at, id) cursor without COUNT or
+    # the filter dropdown queries
+    output = request.args.get('format')
+    if output in ('fragment', 'json'):
+        cursor = request.args.get('cursor')
+        created_at, job_id = decode_cursor(cursor) if cursor else (None, None)
+        job_ids = search_cache.ids_after(request.args, job_id, per_page + 1)
+        if job_ids is not None:
+            jobs = search_cache.load_jobs(job_ids)
+        else:
+            query = filter_jobs(request.args).order_by(Job.created_at.desc(), Job.id.desc())
+            if cursor:
+                query = query.filter(
+                    (Job.created_at < created_at) |
+                    ((Job.created_at == created_at) & (Job.id < job_id))
+                )
+            jobs = query.limit(per_page + 1).all()
+        next_cursor = encode_cursor(jobs[per_page - 1]) if len(jobs) > per_page else None
+        jobs = jobs[:per_page]
+        
+        if output == 'json':
+            return jsonify({'jobs': [job_summary(job) for job in jobs], 'next_cursor': next_cursor})
+        
+        response = make_response(render_template('_job_cards.html', jobs=jobs, cursor=cursor))
+        response.headers['X-Next-Cursor'] = next_cursor or ''
+        return response
+    
+    # Get the filtered jobs with pagination, from cached id lists when enabled
+    jobs_pagination = search_cache.paginate(request.args, page, per_page)
+    
+    # Extract jobs from pagination
+    jobs = jobs_pagination.items
+    next_cursor = encode_cursor(jobs[-1]) if jobs_pagination.has_next else None
+    
+    # Get unique values for filters
+    job_types = db.session.query(Job.job_type).distinct().all()
+    job_types = [t[0] for t in job_types if t[0]]  # Extract from tuple and filter out None
+    
+    experience_levels = db.session.query(Job.experience).distinct().all()
+    experience_levels = [e[0] for e in experience_levels if e[0]]  # Extract from tuple and filter out None
+    
+    # Check which jobs are saved by the current user
+    saved_job_ids = []
+    if current_user.is_authenticated:
+        saved_job_ids = [sj.job_id for sj in current_user.saved_jobs]
+    
+    return render_template(
+        'jobs.html',
+        jobs=jobs,
+        jobs_pagination=jobs_pagination,
+        next_cursor=next_cursor,
+        search=search,
+        location=location,
+        radius=radius,
+        radius_options=RADIUS_OPTIONS_KM,
+        remote=remote,
+        job_types=job_types,
+        experience_levels=experience_levels,
+        selected_type=job_type,
+        selected_experience=experience,
+        selected_min_salary=min_salary,
+        saved_job_ids=saved_job_ids
+    )
+
+@bp.route('/jobs/autocomplete')
+@read_replica
+def autocomplete_jobs():
+    prefix = request.args.get('q', '')
+    kinds = autocomplete.LOCATION_KINDS if request.args.get('field') == 'location' else autocomplete.SEARCH_KINDS
+    limit = request.args.get('limit', 8, type=int)
+    limit = max(1, min(limit, current_app.config['AUTOCOMPLETE_MAX_RESULTS']))
+    
+    suggestions = autocomplete.get_index().lookup(prefix, kinds, limit)
+    response = jsonify({'suggestions': suggestions})
+    # Suggestions are the same for every user; let browsers reuse them briefly
+    response.cache_control.public = True
+    response.cache_control.max_age = 30
+    return response
+
+@bp.route('/job/<int:job_id>')
+@read_replica
+def job_detail(job_id):
+    job = get_job_or_404(job_id)
+    has_applied = False
+    is_saved = False
+    
+    if current_user.is_authenticated:
+        has_applied = Application.query.filter_by(job_id=job_id, user_id=current_user.id).first() is not None
+        is_saved = SavedJob.query.filter_by(job_id=job_id, user_id=current_user.id).first() is not None
+    
+    # Get similar jobs (same company or similar title)
+    similar_jobs = Job.query.filter(
+        Job.id != job_id,
+        Job.status == 'active',
+        (Job.company == job.company) | (Job.title.ilike(f'%{job.title.split()[0]}%'))
+    ).limit(3).all()
+    
+    return render_template('job_detail.html', job=job, has_applied=has_applied, is_saved=is_saved, similar_jobs=similar_jobs)
@@ -0,0 +1,272 @@
+"""
+Recruiter routes: posting, importing and managing jobs and their applications
+"""
+from datetime import datetime
+
+from flask import Blueprint, Response, abort, current_app, render_template, redirect, url_for, flash, request
+from flask_login import login_required, current_user
+
+import analytics
+import bulk_import
+import job_archive
+import job_purge
+import live_events
+from database import read_replica
+from extensions import db
+from models import ArchivedApplication, ArchivedJob, Job, Application, get_job_or_404
+from signals import jobs_changed
+
+bp = Blueprint('recruiter', __name__)
+
+@bp.route('/recruiter/dashboard')
+@read_replica
+@login_required
+def recruiter_dashboard():
+    if current_user.role != 'recruiter':
+        return redirect(url_for('auth.dashboard'))
+    
+    jobs = Job.query.filter_by(recruiter_id=current_user.id, deleted_at=None).order_by(Job.created_at.desc()).all()
+    
+    # One grouped COUNT instead of loading every job's applications
+    application_counts = dict(
+        db.session.query(Application.job_id, db.func.count(Application.id))
+        .filter(Application.job_id.in_([job.id for job in jobs]))
+        .group_by(Application.job_id)
+    ) if jobs else {}
+    return render_template('recruiter_dashboard.html', jobs=jobs, application_counts=application_counts)
+
+@bp.route('/recruiter/job/new', methods=['GET', 'POST'])
+@login_required
+def post_job():
+    if current_user.role != 'recruiter':
+        flash('Only recruiters can post jobs', 'error')
+        return redirect(url_for('auth.dashboard'))
+    
+    if request.method == 'POST':
+        job = Job(
+            title=request.form.get('title'),
+            company=request.form.get('company'),
+            location=request.form.get('location'),
+            job_type=request.form.get('job_type'),
+            experience=request.form.get('experience'),
+            salary=request.form.get('salary'),
+            skills=request.form.get('skills'),
+            description=request.form.get('description'),
+            requirements=request.form.get('requirements'),
+            recruiter_id=current_user.id
+        )
+        db.session.add(job)
+        db.session.commit()
+        jobs_changed.send(Job, job_ids=[job.id])
+        flash('Job posted successfully!', 'success')
+        return redirect(url_for('recruiter.recruiter_dashboard'))
+    
+    return render_template('post_job.html')
+
+@bp.route('/recruiter/jobs/import', methods=['GET', 'POST'])
+@login_required
+def import_jobs():
+    if current_user.role != 'recruiter':
+        flash('Only recruiters can import jobs', 'error')
+        return redirect(url_for('auth.dashboard'))
+    
+    report = None
+    if request.method == 'POST':
+        upload = request.files.get('file')
+        fmt = request.form.get('format') or (bulk_import.detect_format(upload.filename) if upload else None)
+        
+        if not upload or upload.filename == '':
+            flash('Please choose a CSV or JSONL file to import', 'error')
+        elif fmt not in bulk_import.FORMATS:
+            flash('Unsupported file type. Upload a .csv or .jsonl file.', 'error')
+        else:
+            report = bulk_import.import_jobs(db, Job, upload.stream, fmt, current_user.id)
+            if report.imported:
+                flash(f'Imported {report.imported} jobs successfully!', 'success')
+            if report.errors:
+                flash(f'{report.failed} rows were skipped because of errors', 'warning')
+    
+    return render_template('import_jobs.html', report=report)
+
+@bp.route('/recruiter/job/<int:job_id>/edit', methods=['GET', 'POST'])
+@login_required
+def edit_job(job_id):
+    job = get_job_or_404(job_id)
+    
+    if current_user.role != 'recruiter' or job.recruiter_id != current_user.id:
+        flash('Unauthorized access', 'error')
+        return redirect(url_for('auth.dashboard'))
+    
+    if request.method == 'POST':
+        job.title = request.form.get('title')
+        job.company = request.form.get('company')
+        job.location = request.form.get('location')
+        job.job_type = request.form.get('job_type')
+        job.experience = request.form.get('experience')
+        job.salary = request.form.get('salary')
+        job.skills = request.form.get('skills')
+        job.description = request.form.get('description')
+        job.requirements = request.form.get('requirements')
+        db.session.commit()
+        jobs_changed.send(Job, job_ids=[job.id])
+        flash('Job updated successfully!', 'success')
+        return redirect(url_for('recruiter.recruiter_dashboard'))
+    
+    return render_template('edit_job.html', job=job)
+
+@bp.route('/recruiter/job/<int:job_id>/delete', methods=['POST'])
+@login_required
+def delete_job(job_id):
+    job = get_job_or_404(job_id)
+    
+    if current_user.role != 'recruiter' or job.recruiter_id != current_user.id:
+        flash('Unauthorized access', 'error')
+        return redirect(url_for('auth.dashboard'))
+    
+    # Hidden immediately; applications and saved jobs are purged in the background
+    job_purge.delete_job(current_app._get_current_object(), job)
+    jobs_changed.send(Job, job_ids=[job_id])
+    flash('Job deleted successfully!', 'success')
+    return redirect(url_for('recruiter.recruiter_dashboard'))
+
+@bp.route('/recruiter/job/<int:job_id>/applications')
+@read_replica
+@login_required
+def view_applications(job_id):
+    job = get_job_or_404(job_id)
+    
+    if current_user.role != 'recruiter' or job.recruiter_id != current_user.id:
+        flash('Unauthorized access', 'error')
+        return redirect(url_for('auth.dashboard'))
+    
+    applications = Application.query.filter_by(job_id=job_id).order_by(Application.applied_at.desc()).all()
+    return render_template('view_applications.html', job=job, applications=applications)
+
+@bp.route('/recruiter/analytics')
+@bp.route('/recruiter/job/<int:job_id>/analytics')
+@read_replica
+@login_required
+def recruiter_analytics(job_id=None):
+    if current_user.role != 'recruiter':
+        return redirect(url_for('auth.dashboard'))
+    
+    days = request.args.get('days', 30, type=int)
+    if days not in analytics.WINDOWS_DAYS:
+        days = 30
+    
+    jobs = Job.query.filter_by(recruiter_id=current_user.id, deleted_at=None).order_by(Job.created_at.desc()).all()
+    job = None
+    if job_id is not None:
+        job = next((j for j in jobs if j.id == job_id), None)
+        if job is None:
+            flash('Unauthorized access', 'error')
+            return redirect(url_for('recruiter.recruiter_dashboard'))
+    
+    # Reads only the rollup rows in the window, never the applications
+    totals, by_job, per_day = analytics.funnel([job.id] if job else [j.id for j in jobs], days)
+    return render_template(
+        'recruiter_analytics.html',
+        job=job,
+        jobs=jobs,
+        days=days,
+        windows=analytics.WINDOWS_DAYS,
+        totals=totals,
+        by_job=by_job,
+        per_day=per_day,
+    )
+
+@bp.route('/recruiter/archive')
+@read_replica
+@login_required
+def archived_jobs():
+    if current_user.role != 'recruiter':
+        return redirect(url_for('auth.dashboard'))
+    
+    page = request.args.get('page', 1, type=int)
+    jobs_pagination = ArchivedJob.query.filter_by(recruiter_id=current_user.id).order_by(
+        ArchivedJob.archived_at.desc(), ArchivedJob.id.desc()
+    ).paginate(page=page, per_page=20, error_out=False)
+    return render_template(
+        'archived_jobs.html',
+        jobs_pagination=jobs_pagination,
+        application_counts=job_archive.application_counts(jobs_pagination.items),
+        endpoint='recruiter.archived_jobs',
+        back_url=url_for('recruiter.recruiter_dashboard'),
+    )
+
+@bp.route('/recruiter/archive/<int:job_id>/applications')
+@read_replica
+@login_required
+def archived_applications(job_id):
+    job = ArchivedJob.query.get_or_404(job_id)
+    
+    # Admins can open any archived job from the admin archive
+    if current_user.role != 'admin' and (current_user.role != 'recruiter' or job.recruiter_id != current_user.id):
+        flash('Unauthorized access', 'error')
+        return redirect(url_for('auth.dashboard'))
+    
+    applications = job.applications.order_by(ArchivedApplication.applied_at.desc()).all()
+    return render_template('archived_applications.html', job=job, applications=applications)
+
+@bp.route('/recruiter/application/<int:application_id>')
+@login_required
+def application_item(application_id):
+    """One rendered application card, fetched by pages that receive live events"""
+    application = Application.query.get_or_404(application_id)
+    
+    if current_user.role != 'recruiter' or application.job.recruiter_id != current_user.id:
+        abort(403)
+    
+    return render_template('_application_item.html', application=application)
+
+@bp.route('/recruiter/events')
+@login_required
+def application_events():
+    """Server-sent events for new applications and status changes on the recruiter's jobs"""
+    if current_user.role != 'recruiter':
+        abort(403)
+    broker = current_app.extensions.get('live_events')
+    if broker is None or not current_app.config['LIVE_EVENTS_ENABLED']:
+        return '', 204  # tells EventSource not to reconnect
+    
+    job_ids = [job_id for (job_id,) in db.session.query(Job.id).filter_by(recruiter_id=current_user.id, deleted_at=None)]
+    # Don't hold a pooled connection for the life of the stream
+    db.session.close()
+    
+    subscription = broker.subscribe(job_ids)
+    if subscription is None:
+        # Too many open streams in this process: ask the browser to come back later
+        body = live_events.busy_response_body(current_app.config['SSE_BUSY_RETRY_SECONDS'])
+    else:
+        body = live_events.stream(
+            broker, subscription,
+            current_app.config['SSE_KEEPALIVE_SECONDS'], current_app.config['SSE_MAX_SECONDS'],
+        )
+    response = Response(body, mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'  # stop nginx from buffering the stream
+    return response
+
+@bp.route('/recruiter/application/<int:application_id>/update', methods=['POST'])
+@login_required
+def update_application_status(application_id):
+    application = Application.query.get_or_404(application_id)
+    
+    if current_user.role != 'recruiter' or application.job.recruiter_id != current_user.id:
+        flash('Unauthorized access', 'error')
+        return redirect(url_for('auth.dashboard'))
+    
+    new_status = request.form.get('status')
+    if new_status not in analytics.REVIEW_STATUSES:
+        flash('Invalid application status', 'error')
+        return redirect(url_for('recruiter.view_applications', job_id=application.job_id))
+    
+    old_status, old_since = application.status, application.updated_at
+    application.status = new_status
+    analytics.record_status_change(application, old_status, old_since, datetime.utcnow())
+    db.session.commit()
+    live_events.publish(application.job_id, 'status', {
+        'id': application.id, 'job_id': application.job_id, 'status': new_status,
+    })
+    flash('Application status updated!', 'success')
+    return redirect(url_for('recruiter.view_applications', job_id=application.job_id))
@@ -0,0 +1,205 @@
+"""
+Job seeker routes: applying, saving jobs and tracking applications
+"""
+import os
+import uuid
+from datetime import datetime
+
+from flask import Blueprint, abort, render_template, redirect, url_for, flash, request, jsonify
+from flask_login import login_required, current_user
+from werkzeug.utils import secure_filename
+
+import analytics
+import live_events
+from database import insert_ignoring_conflicts, read_replica
+from extensions import db
+from models import Job, SavedJob, Application, get_job_or_404
+
+bp = Blueprint('seeker', __name__)
+
+CLOSED_JOB_MESSAGE = 'This job is no longer accepting applications'
+
+@bp.route('/job-seeker/dashboard')
+@read_replica
+@login_required
+def job_seeker_dashboard():
+    if current_user.role != 'job_seeker':
+        return redirect(url_for('auth.dashboard'))
+    
+    applications = Application.query.filter_by(user_id=current_user.id).order_by(Application.applied_at.desc()).all()
+    return render_template('job_seeker_dashboard.html', applications=applications)
+
+def allowed_file(filename):
+    return '.' in filename and \
+           filename.rsplit('.', 1)[1].lower() in {'pdf', 'doc', 'docx'}
+
+@bp.route('/job/<int:job_id>/apply', methods=['GET', 'POST'])
+@login_required
+def apply_job(job_id):
+    if request.method == 'POST':
+        cover_letter = request.form.get('cover_letter', '').strip()
+        resume = request.files.get('resume')
+        
+        if not cover_letter:
+            flash('Cover letter is required', 'danger')
+            return redirect(request.url)
+            
+        # Handle resume upload
+        resume_url = None
+        if resume and resume.filename != '':
+            if not allowed_file(resume.filename):
+                flash('Invalid file type. Only PDF, DOC, and DOCX files are allowed.', 'danger')
+                return redirect(request.url)
+                
+            # Create uploads directory if it doesn't exist
+            if not os.path.exists('uploads/resumes'):
+                os.makedirs('uploads/resumes')
+                
+            # Generate a unique filename
+            filename = secure_filename(f"{current_user.id}_{int(datetime.utcnow().timestamp())}_{resume.filename}")
+            resume_path = os.path.join('uploads/resumes', filename)
+            resume.save(resume_path)
+            resume_url = resume_path
+            
+        # Create application in one statement: the job must be open and the
+        # unique (job_id, user_id) index turns a repeat submit into a no-op
+        idempotency_key = request.headers.get('Idempotency-Key') or request.form.get('idempotency_key')
+        now = datetime.utcnow()
+        application_id = db.session.execute(
+            insert_ignoring_conflicts(db, Application).from_select(
+                ['job_id', 'user_id', 'cover_letter', 'resume_url', 'status', 'applied_at', 'updated_at', 'idempotency_key'],
+                db.select(
+                    Job.id, db.literal(current_user.id), db.literal(cover_letter), db.literal(resume_url),
+                    db.literal('pending'), db.literal(now), db.literal(now), db.literal(idempotency_key),
+                ).where(Job.id == job_id, Job.deleted_at.is_(None), Job.status == 'active'),
+            ).returning(Application.id)
+        ).scalar()
+        if application_id is not None:
+            analytics.record_application(job_id, now)
+        db.session.commit()
+        if application_id is not None:
+            live_events.publish(job_id, 'application', {'id': application_id, 'job_id': job_id})
+        
+        if application_id is None:
+            if resume_url:
+                os.remove(resume_url)
+            existing_application = Application.query.filter_by(job_id=job_id, user_id=current_user.id).first()
+            if existing_application is None:
+                get_job_or_404(job_id)
+                flash(CLOSED_JOB_MESSAGE, 'warning')
+                return redirect(url_for('jobs.job_detail', job_id=job_id))
+            if not idempotency_key or existing_application.idempotency_key != idempotency_key:
+                flash('You have already applied to this job', 'warning')
+                return redirect(url_for('jobs.job_detail', job_id=job_id))
+            # Same submit seen twice (double click or retry): report success again
+        
+        flash('Your application has been submitted successfully!', 'success')
+        return redirect(url_for('seeker.my_applications'))
+    
+    job = get_job_or_404(job_id)
+    
+    # Check if user has already applied
+    existing_application = Application.query.filter_by(job_id=job_id, user_id=current_user.id).first()
+    if existing_application:
+        flash('You have already applied to this job', 'warning')
+        return redirect(url_for('jobs.job_detail', job_id=job_id))
+    if job.status != 'active':
+        flash(CLOSED_JOB_MESSAGE, 'warning')
+        return redirect(url_for('jobs.job_detail', job_id=job_id))
+    
+    return render_template('apply_job.html', job=job, idempotency_key=uuid.uuid4().hex)
+
+@bp.route('/job/<int:job_id>/save', methods=['POST'])
+@login_required
+def save_job(job_id):
+    # Clients send the state they want ({"saved": true/false}), so a retried
+    # request can't flip it back; without it the request toggles
+    wanted = (request.get_json(silent=True) or {}).get('saved')
+    
+    if wanted is not True:
+        removed = db.session.execute(
+            db.delete(SavedJob)
+            .where(SavedJob.user_id == current_user.id, SavedJob.job_id == job_id)
+            .returning(SavedJob.id)
+        ).first()
+        db.session.commit()
+        if removed is not None or wanted is False:
+            return jsonify({'saved': False, 'message': 'Job removed from saved jobs'}), 200
+    
+    saved_id = db.session.execute(
+        insert_ignoring_conflicts(db, SavedJob).from_select(
+            ['user_id', 'job_id', 'saved_at'],
+            db.select(db.literal(current_user.id), Job.id, db.literal(datetime.utcnow()))
+            .where(Job.id == job_id, Job.deleted_at.is_(None)),
+        ).returning(SavedJob.id)
+    ).scalar()
+    db.session.commit()
+    
+    # Nothing inserted: either it was already saved or the job doesn't exist
+    if saved_id is None and not SavedJob.query.filter_by(user_id=current_user.id, job_id=job_id).first():
+        abort(404)
+    return jsonify({'saved': True, 'message': 'Job saved successfully'}), 200
+
+@bp.route('/my-applications')
+@read_replica
+@login_required
+def my_applications():
+    if current_user.role != 'job_seeker':
+        flash('Only job seekers can view applications', 'error')
+        return redirect(url_for('auth.dashboard'))
+    
+    # Get pagination parameters
+    page = request.args.get('page', 1, type=int)
+    per_page = 10
+    
+    # Get filter parameters
+    status = request.args.get('status', 'all')
+    
+    # Base query
+    query = Application.query.filter_by(user_id=current_user.id)
+    
+    # Apply status filter
+    if status and status != 'all':
+        query = query.filter_by(status=status)
+    
+    # Order by application date (newest first)
+    applications = query.order_by(Application.applied_at.desc())
+    
+    # Paginate results
+    applications_pagination = applications.paginate(page=page, per_page=per_page, error_out=False)
+    
+    # Get application status counts for the filter
+    status_counts = {
+        'all': Application.query.filter_by(user_id=current_user.id).count(),
+        'pending': Application.query.filter_by(user_id=current_user.id, status='pending').count(),
+        'reviewed': Application.query.filter_by(user_id=current_user.id, status='reviewed').count(),
+        'accepted': Application.query.filter_by(user_id=current_user.id, status='accepted').count(),
+        'rejected': Application.query.filter_by(user_id=current_user.id, status='rejected').count()
+    }
+    
+    return render_template(
+        'my_applications.html',
+        applications_pagination=applications_pagination,
+        status_counts=status_counts,
+        current_status=status
+    )
+
+@bp.route('/saved-jobs')
+@read_replica
+@login_required
+def saved_jobs():
+    if current_user.role != 'job_seeker':
+        flash('Only job seekers can save jobs', 'error')
+        return redirect(url_for('auth.dashboard'))
+    
+    # Get pagination parameters
+    page = request.args.get('page', 1, type=int)
+    per_page = 10
+    
+    # Get saved jobs with job details
+    query = SavedJob.query.filter_by(user_id=current_user.id).join(Job).filter(Job.status == 'active').order_by(SavedJob.saved_at.desc())
+    
+    # Paginate results
+    saved_jobs_pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+    
+    return render_template('saved_jobs.html', saved_jobs_pagination=saved_jobs_pagination)
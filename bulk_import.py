@@ -0,0 +1,195 @@
+"""
+Bulk job import from CSV or JSON Lines files
+
+Rows are parsed lazily from the uploaded stream, validated one at a time and
+written in chunked multi-row INSERT statements, so a file with thousands of
+postings costs a handful of round trips instead of one request per job.
+"""
+import csv
+import io
+import json
+from datetime import datetime
+
+from signals import jobs_changed
+
+REQUIRED_FIELDS = ('title', 'company', 'location', 'description')
+OPTIONAL_FIELDS = ('job_type', 'experience', 'salary', 'skills', 'requirements')
+FIELD_MAX_LENGTHS = {
+    'title': 200,
+    'company': 200,
+    'location': 200,
+    'job_type': 50,
+    'experience': 50,
+    'salary': 100,
+}
+JOB_TYPES = {'full-time', 'part-time', 'contract', 'internship'}
+FORMATS = ('csv', 'jsonl')
+CHUNK_SIZE = 500
+
+
+class ImportReport:
+    """Outcome of a bulk import: inserted job ids and per-row errors"""
+
+    def __init__(self):
+        self.job_ids = []
+        self.errors = []  # list of (line number, message)
+        self.rows_read = 0
+
+    @property
+    def imported(self):
+        return len(self.job_ids)
+
+    @property
+    def failed(self):
+        return len({line for line, _ in self.errors})
+
+    def add_error(self, line, message):
+        self.errors.append((line, message))
+
+
+def detect_format(filename):
+    """Guess the file format from its extension, or return None"""
+    if not filename or '.' not in filename:
+        return None
+    ext = filename.rsplit('.', 1)[1].lower()
+    if ext == 'csv':
+        return 'csv'
+    if ext in ('jsonl', 'ndjson'):
+        return 'jsonl'
+    return None
+
+
+def iter_rows(stream, fmt):
+    """Yield (line number, row dict or error message) pairs from a binary stream
+
+    A file that is not UTF-8 text or not well-formed CSV can't be read past
+    the bad spot, so that yields one last error and ends the rows.
+    """
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    if fmt == 'csv':
+        reader = csv.DictReader(text)
+        rows = iter(reader)
+        while True:
+            try:
+                row = next(rows)
+            except StopIteration:
+                return
+            except (UnicodeDecodeError, csv.Error) as e:
+                yield reader.line_num + 1, _read_error(e)
+                return
+            # line_num points at the last physical line of the record
+            yield reader.line_num, row
+    elif fmt == 'jsonl':
+        line_number = 0
+        lines = iter(text)
+        while True:
+            try:
+                line = next(lines)
+            except StopIteration:
+                return
+            except UnicodeDecodeError as e:
+                yield line_number + 1, _read_error(e)
+                return
+            line_number += 1
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as e:
+                yield line_number, f'Invalid JSON: {e}'
+                continue
+            if not isinstance(row, dict):
+                yield line_number, 'Each line must be a JSON object'
+                continue
+            yield line_number, row
+    else:
+        raise ValueError(f'Unsupported import format: {fmt}')
+
+
+def _read_error(error):
+    if isinstance(error, UnicodeDecodeError):
+        return 'File is not UTF-8 encoded text; the rest of the file was not read'
+    return f'Malformed CSV ({error}); the rest of the file was not read'
+
+
+def validate_row(row):
+    """Return (values, errors) for one parsed row"""
+    values = dict.fromkeys(REQUIRED_FIELDS + OPTIONAL_FIELDS)
+    errors = []
+
+    for field in REQUIRED_FIELDS + OPTIONAL_FIELDS:
+        value = row.get(field)
+        if value is not None and not isinstance(value, str):
+            value = str(value)
+        value = (value or '').strip()
+
+        if not value:
+            if field in REQUIRED_FIELDS:
+                errors.append(f'{field} is required')
+            continue
+
+        max_length = FIELD_MAX_LENGTHS.get(field)
+        if max_length and len(value) > max_length:
+            errors.append(f'{field} must be at most {max_length} characters')
+            continue
+
+        values[field] = value
+
+    if values['job_type']:
+        values['job_type'] = values['job_type'].lower()
+        if values['job_type'] not in JOB_TYPES:
+            errors.append(f"job_type must be one of: {', '.join(sorted(JOB_TYPES))}")
+
+    return values, errors
+
+
+def import_jobs(db, job_model, stream, fmt, recruiter_id, chunk_size=CHUNK_SIZE):
+    """Validate and insert every row of ``stream`` as a Job owned by ``recruiter_id``
+
+    Valid rows are inserted ``chunk_size`` at a time and each chunk is
+    committed on its own, so rows that fail validation never block the rest
+    of the file. ``jobs_changed`` is sent once at the end for every committed
+    job, even if the import stops early.
+    """
+    report = ImportReport()
+    pending = []
+
+    def flush():
+        if not pending:
+            return
+        result = db.session.execute(
+            db.insert(job_model).returning(job_model.id),
+            pending,
+        )
+        report.job_ids.extend(result.scalars().all())
+        db.session.commit()
+        pending.clear()
+
+    try:
+        for line_number, row in iter_rows(stream, fmt):
+            report.rows_read += 1
+            if isinstance(row, str):
+                report.add_error(line_number, row)
+                continue
+
+            values, errors = validate_row(row)
+            if errors:
+                for error in errors:
+                    report.add_error(line_number, error)
+                continue
+
+            values['recruiter_id'] = recruiter_id
+            values['status'] = 'active'
+            values['created_at'] = datetime.utcnow()
+            pending.append(values)
+
+            if len(pending) >= chunk_size:
+                flush()
+
+        flush()
+    finally:
+        # Chunks already committed stay imported even if a later one fails
+        if report.job_ids:
+            jobs_changed.send(job_model, job_ids=report.job_ids)
+
+    return report
@@ -0,0 +1,154 @@
+"""
+Flask CLI commands for Job Portal
+
+    flask --app app init-db
+    flask --app app import-jobs jobs.csv --recruiter recruiter@google.com
+    flask --app app precompile-templates
+    flask --app app build-assets
+    flask --app app normalize-locations
+    flask --app app purge-jobs
+    flask --app app sweep-jobs
+    flask --app app backfill-analytics
+"""
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from sqlalchemy import inspect
+
+import analytics
+import bulk_import
+import database
+import geo
+import job_archive
+import job_purge
+import static_assets
+import templating
+from extensions import db
+from models import Application, User, Job
+
+def duplicate_applications():
+    """Applications repeating an earlier one's (job, user) pair, which block the unique index"""
+    if not inspect(db.engine).has_table(Application.__tablename__):
+        return []
+    first_ids = db.select(db.func.min(Application.id)).group_by(Application.job_id, Application.user_id)
+    return db.session.query(
+        Application.id, Application.job_id, Application.user_id, Application.applied_at
+    ).filter(Application.id.not_in(first_ids)).order_by(Application.id).all()
+
+def init_db(dedupe=False):
+    """Create or upgrade database tables and the admin user if needed
+
+    Duplicate applications stop the upgrade unless ``dedupe`` is set, in
+    which case all but the first application per (job, user) are deleted.
+    """
+    duplicates = duplicate_applications()
+    if duplicates:
+        print(f"⚠️  {len(duplicates)} application(s) repeat an earlier one by the same user to the same job:")
+        for application_id, job_id, user_id, applied_at in duplicates:
+            print(f"   application {application_id}: job {job_id}, user {user_id}, applied {applied_at}")
+        if not dedupe:
+            raise click.ClickException(
+                'Duplicate applications block the unique index; re-run init-db with --dedupe to delete them'
+            )
+        ids = [application_id for application_id, *_ in duplicates]
+        for i in range(0, len(ids), 500):
+            Application.query.filter(Application.id.in_(ids[i:i + 500])).delete(synchronize_session=False)
+        db.session.commit()
+        print(f"✅ Removed {len(ids)} duplicate applications")
+    database.upgrade_schema(db)
+    
+    # Create admin user if not exists
+    if not User.query.filter_by(username='admin').first():
+        admin = User(
+            username='admin',
+            email='admin@jobportal.com',
+            role='admin',
+            full_name='Admin User',
+            phone='+1-555-000-0000'
+        )
+        admin.set_password('admin123')
+        db.session.add(admin)
+        db.session.commit()
+        print("✅ Admin user created: admin@jobportal.com / admin123")
+    else:
+        print("✅ Admin user already exists")
+
+@click.command('init-db')
+@click.option('--dedupe', is_flag=True, help='Delete duplicate applications (all but the first per job and user)')
+@with_appcontext
+def init_db_command(dedupe):
+    """Create database tables and the admin user"""
+    init_db(dedupe=dedupe)
+
+@click.command('import-jobs')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--recruiter', 'recruiter_email', required=True, help='Email of the recruiter who will own the jobs')
+@click.option('--format', 'fmt', type=click.Choice(bulk_import.FORMATS), help='File format (detected from the extension by default)')
+@click.option('--chunk-size', default=bulk_import.CHUNK_SIZE, show_default=True, help='Rows per INSERT statement')
+@with_appcontext
+def import_jobs_command(path, recruiter_email, fmt, chunk_size):
+    """Bulk import jobs from a CSV or JSONL file"""
+    recruiter = User.query.filter_by(email=recruiter_email.strip().lower(), role='recruiter').first()
+    if not recruiter:
+        raise click.ClickException(f'No recruiter with email {recruiter_email}')
+    
+    fmt = fmt or bulk_import.detect_format(path)
+    if fmt not in bulk_import.FORMATS:
+        raise click.ClickException('Could not detect file format, pass --format csv or --format jsonl')
+    
+    with open(path, 'rb') as f:
+        report = bulk_import.import_jobs(db, Job, f, fmt, recruiter.id, chunk_size=chunk_size)
+    
+    for line, message in report.errors:
+        click.echo(f'line {line}: {message}', err=True)
+    click.echo(f'Read {report.rows_read} rows, imported {report.imported} jobs, skipped {report.failed}')
+
+@click.command('precompile-templates')
+@with_appcontext
+def precompile_templates_command():
+    """Compile all templates into the Jinja bytecode cache"""
+    count, elapsed_ms = templating.precompile_templates(current_app)
+    click.echo(f'Compiled {count} templates in {elapsed_ms:.1f} ms')
+
+@click.command('build-assets')
+@with_appcontext
+def build_assets_command():
+    """Fingerprint and precompress static files into static/dist"""
+    manifest = static_assets.build_assets(current_app.static_folder)
+    encodings = 'gzip and brotli' if static_assets.brotli is not None else 'gzip'
+    click.echo(f'Built {len(manifest)} assets with {encodings} variants')
+
+@click.command('normalize-locations')
+@with_appcontext
+def normalize_locations_command():
+    """Parse every job's location into the normalized Location table"""
+    count = geo.assign_locations()
+    click.echo(f'Normalized locations for {count} jobs ({db.session.query(geo.Location).count()} distinct locations)')
+
+@click.command('purge-jobs')
+@click.option('--batch-size', type=int, help='Rows per DELETE (default: JOB_PURGE_BATCH_SIZE)')
+@with_appcontext
+def purge_jobs_command(batch_size):
+    """Remove deleted jobs with their applications and saved jobs"""
+    batch_size = batch_size or current_app.config['JOB_PURGE_BATCH_SIZE']
+    jobs, rows = job_purge.purge_deleted_jobs(batch_size, current_app.config['JOB_PURGE_BATCH_PAUSE_MS'] / 1000)
+    click.echo(f'Purged {jobs} deleted jobs ({rows} rows)')
+
+@click.command('sweep-jobs')
+@with_appcontext
+def sweep_jobs_command():
+    """Expire old jobs and move long-closed jobs to the archive"""
+    expired, archived = job_archive.sweep_jobs(current_app.config)
+    click.echo(f'Expired {len(expired)} jobs, archived {len(archived)} jobs')
+
+@click.command('backfill-analytics')
+@with_appcontext
+def backfill_analytics_command():
+    """Rebuild the recruiter analytics rollups of live jobs from their applications"""
+    count = analytics.backfill()
+    click.echo(f'Rebuilt analytics rollups from {count} applications')
+
+COMMANDS = (
+    init_db_command, import_jobs_command, precompile_templates_command, build_assets_command,
+    normalize_locations_command, purge_jobs_command, sweep_jobs_command, backfill_analytics_command,
+)
@@ -0,0 +1,107 @@
+"""
+Response compression for Job Portal
+
+Compresses HTML, JSON and other text responses with brotli (when the optional
+``Brotli`` package from requirements-compression.txt is installed and the
+client accepts it) or gzip. Small bodies, non-text content types and
+responses that already carry a Content-Encoding (such as precompressed
+assets) are left alone.
+
+Streamed responses are compressed chunk by chunk and flushed after each one,
+so a client keeps receiving data progressively instead of waiting for the
+whole export to finish.
+"""
+import zlib
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+def _gzip_compressor(level):
+    # wbits=31 selects the gzip container
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    return (
+        compressor.compress,
+        lambda: compressor.flush(zlib.Z_SYNC_FLUSH),
+        compressor.flush,
+    )
+
+def _brotli_compressor(quality):
+    compressor = brotli.Compressor(quality=quality)
+    return compressor.process, compressor.flush, compressor.finish
+
+def choose_encoding(app_config, accept_encodings):
+    """Pick the first configured algorithm the client accepts, or None"""
+    for encoding in app_config['COMPRESS_ALGORITHMS']:
+        if encoding == 'br' and brotli is None:
+            continue
+        if accept_encodings[encoding]:
+            return encoding
+    return None
+
+def make_compressor(app_config, encoding):
+    """Return (compress, flush, finish) callables for ``encoding``"""
+    if encoding == 'br':
+        return _brotli_compressor(app_config['COMPRESS_BR_QUALITY'])
+    return _gzip_compressor(app_config['COMPRESS_LEVEL'])
+
+def compress_body(app_config, encoding, data):
+    compress, _, finish = make_compressor(app_config, encoding)
+    return compress(data) + finish()
+
+def _compress_stream(app_config, encoding, chunks):
+    compress, flush, finish = make_compressor(app_config, encoding)
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            if chunk:
+                yield compress(chunk) + flush()
+        yield finish()
+    finally:
+        close = getattr(chunks, 'close', None)
+        if close is not None:
+            close()
+
+def should_compress(app_config, response):
+    if not app_config['COMPRESS_ENABLED']:
+        return False
+    if response.status_code < 200 or response.status_code >= 300 or response.status_code in (204, 206):
+        return False
+    if response.direct_passthrough or 'Content-Encoding' in response.headers:
+        return False
+    if response.mimetype not in app_config['COMPRESS_MIMETYPES']:
+        return False
+    if request.method == 'HEAD':
+        return False
+    return True
+
+def init_app(app):
+    @app.after_request
+    def compress_response(response):
+        if not should_compress(app.config, response):
+            return response
+
+        # The body differs by Accept-Encoding from here on, compressed or not
+        response.vary.add('Accept-Encoding')
+        encoding = choose_encoding(app.config, request.accept_encodings)
+        if encoding is None:
+            return response
+
+        if response.is_streamed:
+            response.response = _compress_stream(app.config, encoding, response.response)
+            response.headers.pop('Content-Length', None)
+        else:
+            data = response.get_data()
+            if len(data) < app.config['COMPRESS_MIN_SIZE']:
+                return response
+            response.set_data(compress_body(app.config, encoding, data))
+
+        response.headers['Content-Encoding'] = encoding
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(f'{etag}-{encoding}')
+        return response
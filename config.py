@@ -3,12 +3,119 @@ Configuration file for Job Portal application
 """
 import os
 
+def database_url(value):
+    """Normalize a database URL from the environment"""
+    # Fix for Render/Heroku PostgreSQL URLs
+    if value and value.startswith('postgres://'):
+        value = value.replace('postgres://', 'postgresql://', 1)
+    return value
+
+def env_int(name, default):
+    value = os.environ.get(name)
+    return int(value) if value not in (None, '') else default
+
+def env_bool(name, default):
+    value = os.environ.get(name)
+    if value in (None, ''):
+        return default
+    return value.lower() in ['true', 'on', '1', 'yes']
+
 class Config:
     """Base configuration"""
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-secret-key-change-in-production'
-    SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///jobportal.db'
+    SQLALCHEMY_DATABASE_URI = database_url(os.environ.get('DATABASE_URL')) or 'sqlite:///jobportal.db'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     
+    # Read replica (optional) - read-only routes are served from this database
+    SQLALCHEMY_REPLICA_URI = database_url(os.environ.get('DATABASE_REPLICA_URL'))
+    # Seconds a user keeps reading from the primary after their own POST
+    REPLICA_STICKY_SECONDS = env_int('REPLICA_STICKY_SECONDS', 10)
+    
+    # Connection pool settings
+    DB_POOL_SIZE = env_int('DB_POOL_SIZE', 5)
+    DB_MAX_OVERFLOW = env_int('DB_MAX_OVERFLOW', 10)
+    DB_POOL_TIMEOUT = env_int('DB_POOL_TIMEOUT', 30)
+    DB_POOL_RECYCLE = env_int('DB_POOL_RECYCLE', -1)  # seconds, -1 disables
+    DB_POOL_PRE_PING = env_bool('DB_POOL_PRE_PING', False)
+    DB_STATEMENT_TIMEOUT_MS = env_int('DB_STATEMENT_TIMEOUT_MS', 0)  # PostgreSQL only, 0 disables
+    
+    # SQLite performance profile (opt-in) - WAL journaling so readers don't
+    # block behind writers when several gunicorn workers share one file
+    SQLITE_PERFORMANCE_MODE = env_bool('SQLITE_PERFORMANCE_MODE', False)
+    SQLITE_BUSY_TIMEOUT_MS = env_int('SQLITE_BUSY_TIMEOUT_MS', 5000)
+    SQLITE_MMAP_SIZE = env_int('SQLITE_MMAP_SIZE', 256 * 1024 * 1024)  # bytes
+    SQLITE_CACHE_SIZE = env_int('SQLITE_CACHE_SIZE', -64000)  # negative = KiB
+    
+    # Template caching - compiled templates are stored on disk and reused by new workers
+    JINJA_BYTECODE_CACHE = env_bool('JINJA_BYTECODE_CACHE', True)
+    JINJA_BYTECODE_CACHE_DIR = os.environ.get('JINJA_BYTECODE_CACHE_DIR')  # defaults to instance/jinja_cache
+    JINJA_PRELOAD_TEMPLATES = env_bool('JINJA_PRELOAD_TEMPLATES', False)  # load all templates in create_app()
+    
+    # Response compression (brotli is used when the optional package is installed)
+    COMPRESS_ENABLED = env_bool('COMPRESS_ENABLED', True)
+    COMPRESS_ALGORITHMS = ('br', 'gzip')  # in order of preference
+    COMPRESS_LEVEL = env_int('COMPRESS_LEVEL', 6)  # gzip, 1-9
+    COMPRESS_BR_QUALITY = env_int('COMPRESS_BR_QUALITY', 4)  # brotli, 0-11
+    COMPRESS_MIN_SIZE = env_int('COMPRESS_MIN_SIZE', 500)  # bytes
+    COMPRESS_MIMETYPES = {
+        'text/html', 'text/css', 'text/plain', 'text/csv', 'text/javascript',
+        'application/javascript', 'application/json', 'application/x-ndjson',
+        'image/svg+xml',
+    }
+    
+    # Typeahead suggestions for the job search and location inputs
+    AUTOCOMPLETE_MAX_RESULTS = env_int('AUTOCOMPLETE_MAX_RESULTS', 10)
+    AUTOCOMPLETE_REFRESH_SECONDS = env_int('AUTOCOMPLETE_REFRESH_SECONDS', 30)  # pick up other workers' new jobs
+    AUTOCOMPLETE_REBUILD_SECONDS = env_int('AUTOCOMPLETE_REBUILD_SECONDS', 900)  # full rebuild as a safety net
+    
+    # Deleted jobs disappear immediately; their applications and saved-job rows
+    # are purged afterwards in batches of JOB_PURGE_BATCH_SIZE
+    JOB_PURGE_IN_BACKGROUND = env_bool('JOB_PURGE_IN_BACKGROUND', True)  # False: leave it to `flask purge-jobs`
+    JOB_PURGE_BATCH_SIZE = env_int('JOB_PURGE_BATCH_SIZE', 1000)
+    JOB_PURGE_BATCH_PAUSE_MS = env_int('JOB_PURGE_BATCH_PAUSE_MS', 20)  # let other writers in between batches
+    
+    # Expiry and archival - old active jobs are closed, closed jobs move to the archive tables
+    JOB_EXPIRY_DAYS = env_int('JOB_EXPIRY_DAYS', 60)  # 0 = never expire
+    JOB_ARCHIVE_AFTER_DAYS = env_int('JOB_ARCHIVE_AFTER_DAYS', 30)  # days after closing
+    JOB_SWEEP_INTERVAL_SECONDS = env_int('JOB_SWEEP_INTERVAL_SECONDS', 3600)  # 0 = only `flask sweep-jobs`
+    JOB_SWEEP_BATCH_SIZE = env_int('JOB_SWEEP_BATCH_SIZE', 500)  # jobs per archive transaction
+    
+    # Live recruiter updates over server-sent events (needs a gevent or gthread
+    # worker, and a single worker process)
+    LIVE_EVENTS_ENABLED = env_bool('LIVE_EVENTS_ENABLED', True)
+    SSE_KEEPALIVE_SECONDS = env_int('SSE_KEEPALIVE_SECONDS', 15)
+    SSE_MAX_SECONDS = env_int('SSE_MAX_SECONDS', 300)  # streams close and the browser reconnects
+    SSE_QUEUE_SIZE = env_int('SSE_QUEUE_SIZE', 100)  # events buffered per client
+    SSE_MAX_STREAMS = env_int('SSE_MAX_STREAMS', 4)  # per process; keep well below gthread's --threads (0 = no cap)
+    SSE_BUSY_RETRY_SECONDS = env_int('SSE_BUSY_RETRY_SECONDS', 30)  # reconnect delay when at SSE_MAX_STREAMS
+    
+    # Async serving mode (uvicorn asgi:app); see async_views.py
+    ASYNC_VIEWS_ENABLED = env_bool('ASYNC_VIEWS_ENABLED', True)
+    ASYNC_DATABASE_URL = os.environ.get('ASYNC_DATABASE_URL')  # default: DATABASE_URL with an asyncio driver
+    ASGI_THREADS = env_int('ASGI_THREADS', 32)  # threads running the sync parts of requests
+    
+    # Job search result cache; uncached searches are rate limited per client
+    SEARCH_CACHE_ENABLED = env_bool('SEARCH_CACHE_ENABLED', True)
+    SEARCH_CACHE_SIZE = env_int('SEARCH_CACHE_SIZE', 500)  # filter combinations cached per worker
+    SEARCH_CACHE_MAX_IDS = env_int('SEARCH_CACHE_MAX_IDS', 1000)  # result ids kept per search
+    SEARCH_CACHE_TTL_SECONDS = env_int('SEARCH_CACHE_TTL_SECONDS', 300)  # bounds staleness from other hosts
+    SEARCH_SHARED_STATE_PATH = os.environ.get('SEARCH_SHARED_STATE_PATH')  # defaults to instance/search_state.bin
+    SEARCH_WARM_TOP = env_int('SEARCH_WARM_TOP', 20)  # popular searches kept warm in every worker
+    SEARCH_WARM_DAYS = env_int('SEARCH_WARM_DAYS', 7)
+    SEARCH_WARM_INTERVAL_SECONDS = env_int('SEARCH_WARM_INTERVAL_SECONDS', 60)  # query log flushes; 0 = off
+    SEARCH_RATE_LIMIT_PER_MINUTE = env_int('SEARCH_RATE_LIMIT_PER_MINUTE', 30)  # 0 = no limit
+    SEARCH_RATE_LIMIT_BURST = env_int('SEARCH_RATE_LIMIT_BURST', 10)
+    # Reverse proxies in front of the app (e.g. 1 for the Heroku router) whose
+    # X-Forwarded-For/-Proto headers are trusted; the rate limit keys on the
+    # client address they report. 0 trusts none, for direct connections.
+    PROXY_FIX_HOPS = env_int('PROXY_FIX_HOPS', 0)
+    
+    # Per-request sampling profiler for admins (?_profile=1 or X-Profile: 1)
+    PROFILER_ENABLED = env_bool('PROFILER_ENABLED', True)
+    PROFILER_INTERVAL_MS = env_int('PROFILER_INTERVAL_MS', 5)  # time between stack samples
+    PROFILER_MAX_QUERIES = env_int('PROFILER_MAX_QUERIES', 1000)  # SQL statements recorded per profile
+    PROFILER_KEEP = env_int('PROFILER_KEEP', 200)  # newest profiles kept
+    
     # Upload settings
     UPLOAD_FOLDER = 'uploads/resumes'
     MAX_CONTENT_LENGTH = 5 * 1024 * 1024  # 5MB max file size
@@ -41,12 +148,23 @@ class ProductionConfig(Config):
     DEBUG = False
     TESTING = False
     SESSION_COOKIE_SECURE = True
+    
+    DB_POOL_SIZE = env_int('DB_POOL_SIZE', 10)
+    DB_MAX_OVERFLOW = env_int('DB_MAX_OVERFLOW', 20)
+    DB_POOL_RECYCLE = env_int('DB_POOL_RECYCLE', 1800)
+    DB_POOL_PRE_PING = env_bool('DB_POOL_PRE_PING', True)
+    DB_STATEMENT_TIMEOUT_MS = env_int('DB_STATEMENT_TIMEOUT_MS', 30000)
+    
+    JINJA_PRELOAD_TEMPLATES = env_bool('JINJA_PRELOAD_TEMPLATES', True)
 
 class TestingConfig(Config):
     """Testing configuration"""
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///test.db'
     WTF_CSRF_ENABLED = False
+    JOB_SWEEP_INTERVAL_SECONDS = 0
+    SEARCH_WARM_INTERVAL_SECONDS = 0
+    SEARCH_RATE_LIMIT_PER_MINUTE = 0
 
 config = {
     'development': DevelopmentConfig,
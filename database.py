@@ -0,0 +1,231 @@
+"""
+Database engine configuration and read-replica routing for Job Portal
+
+Read-only views are marked with ``@read_replica``. When a replica URL is
+configured, queries issued while handling a GET request to one of those views
+are sent to the replica; everything else (writes, flushes, any other view)
+goes to the primary. After a user submits a POST they keep reading from the
+primary for ``REPLICA_STICKY_SECONDS`` so they always see their own writes.
+
+SQLite databases can opt into a performance profile (WAL journaling,
+relaxed fsync, busy timeout and larger caches) applied to every new
+connection with ``SQLITE_PERFORMANCE_MODE``. Foreign key enforcement is
+always switched on so ON DELETE CASCADE works as it does on other databases.
+"""
+import time
+
+from flask import g, has_app_context, request, session
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event, inspect, text
+
+REPLICA_BIND = 'replica'
+_STICKY_SESSION_KEY = '_primary_until'
+
+
+def engine_options(app_config, url):
+    """Build create_engine() keyword arguments from the DB_* config values"""
+    options = {
+        'pool_pre_ping': app_config['DB_POOL_PRE_PING'],
+        'pool_recycle': app_config['DB_POOL_RECYCLE'],
+    }
+
+    # In-memory SQLite uses a single static connection with no pool to size
+    if not (url.startswith('sqlite') and (':memory:' in url or url.rstrip('/') in ('sqlite:', 'sqlite:/'))):
+        options['pool_size'] = app_config['DB_POOL_SIZE']
+        options['max_overflow'] = app_config['DB_MAX_OVERFLOW']
+        options['pool_timeout'] = app_config['DB_POOL_TIMEOUT']
+
+    statement_timeout = app_config['DB_STATEMENT_TIMEOUT_MS']
+    if statement_timeout and url.startswith('postgresql'):
+        options['connect_args'] = {'options': f'-c statement_timeout={statement_timeout}'}
+
+    return options
+
+
+def configure_engines(app_config):
+    """Fill in SQLAlchemy engine options and the replica bind before db.init_app()"""
+    app_config.setdefault(
+        'SQLALCHEMY_ENGINE_OPTIONS',
+        engine_options(app_config, app_config['SQLALCHEMY_DATABASE_URI']),
+    )
+
+    replica_url = app_config.get('SQLALCHEMY_REPLICA_URI')
+    if replica_url:
+        binds = dict(app_config.get('SQLALCHEMY_BINDS') or {})
+        binds[REPLICA_BIND] = {'url': replica_url, **engine_options(app_config, replica_url)}
+        app_config['SQLALCHEMY_BINDS'] = binds
+
+
+def sqlite_pragmas(app_config):
+    """PRAGMA statements making up the SQLite performance profile"""
+    return [
+        ('journal_mode', 'WAL'),
+        ('synchronous', 'NORMAL'),
+        ('busy_timeout', app_config['SQLITE_BUSY_TIMEOUT_MS']),
+        ('mmap_size', app_config['SQLITE_MMAP_SIZE']),
+        ('cache_size', app_config['SQLITE_CACHE_SIZE']),
+        ('temp_store', 'MEMORY'),
+    ]
+
+
+def apply_sqlite_pragmas(dbapi_connection, pragmas):
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas:
+            cursor.execute(f'PRAGMA {name}={value}')
+    finally:
+        cursor.close()
+
+
+def connection_pragmas(app_config):
+    """PRAGMA statements run on every new SQLite connection"""
+    # SQLite ignores ON DELETE CASCADE unless foreign keys are switched on
+    pragmas = [('foreign_keys', 'ON')]
+    if app_config.get('SQLITE_PERFORMANCE_MODE'):
+        pragmas += sqlite_pragmas(app_config)
+    return pragmas
+
+
+def configure_sqlite(app, db):
+    """Enforce foreign keys (and the performance profile when enabled) on connect"""
+    pragmas = connection_pragmas(app.config)
+
+    def on_connect(dbapi_connection, connection_record):
+        apply_sqlite_pragmas(dbapi_connection, pragmas)
+
+    with app.app_context():
+        for engine in db.engines.values():
+            if engine.dialect.name == 'sqlite':
+                event.listen(engine, 'connect', on_connect)
+
+
+def upgrade_schema(db):
+    """Create missing tables, then add the columns and indexes create_all() skips
+
+    There is no migration tool in this project, so new columns on existing
+    tables are added in place with ALTER TABLE. They must be nullable or have
+    a server_default.
+    """
+    db.create_all()
+    engine = db.engine
+    inspector = inspect(engine)
+    preparer = engine.dialect.identifier_preparer
+
+    with engine.begin() as conn:
+        for table in db.metadata.sorted_tables:
+            existing_columns = {column['name'] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing_columns:
+                    continue
+                ddl = (
+                    f'ALTER TABLE {preparer.format_table(table)} '
+                    f'ADD COLUMN {preparer.format_column(column)} {column.type.compile(dialect=engine.dialect)}'
+                )
+                if column.server_default is not None:
+                    default = column.server_default.arg
+                    ddl += f" DEFAULT {getattr(default, 'text', None) or repr(default)}"
+                    if not column.nullable:
+                        ddl += ' NOT NULL'
+                conn.execute(text(ddl))
+
+            existing_indexes = {index['name'] for index in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in existing_indexes:
+                    index.create(conn)
+
+
+def insert_ignoring_conflicts(db, model):
+    """INSERT for ``model`` that skips rows violating a unique constraint
+
+    Uses ON CONFLICT DO NOTHING on PostgreSQL and SQLite and INSERT IGNORE on
+    MySQL, so check-then-insert races collapse into one statement.
+    """
+    dialect = db.session.get_bind(mapper=inspect(model)).dialect.name
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+        return insert(model).on_conflict_do_nothing()
+    if dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+        return insert(model).on_conflict_do_nothing()
+    return db.insert(model).prefix_with('IGNORE')
+
+
+def increment_or_insert(db, model, key, increments):
+    """Add ``increments`` to the row of ``model`` with primary key ``key``, creating it if missing
+
+    One INSERT ... ON CONFLICT DO UPDATE on PostgreSQL and SQLite, so
+    concurrent writers never lose an update; other databases fall back to an
+    UPDATE followed by an INSERT when no row matched.
+    """
+    table = model.__table__
+    dialect = db.session.get_bind(mapper=inspect(model)).dialect.name
+    if dialect in ('postgresql', 'sqlite'):
+        if dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        statement = insert(model).values(**key, **increments)
+        db.session.execute(statement.on_conflict_do_update(
+            index_elements=[column.name for column in table.primary_key],
+            set_={name: table.c[name] + statement.excluded[name] for name in increments},
+        ))
+        return
+
+    updated = db.session.execute(
+        db.update(model)
+        .where(*(table.c[name] == value for name, value in key.items()))
+        .values({name: table.c[name] + value for name, value in increments.items()})
+    ).rowcount
+    if not updated:
+        db.session.execute(db.insert(model).values(**key, **increments))
+
+
+def read_replica(view):
+    """Mark a view as read-only so its queries may be served by the replica"""
+    view.use_replica = True
+    return view
+
+
+def reads_from_replica():
+    """Whether this request's queries may be served by the (possibly lagging) replica"""
+    return has_app_context() and g.get('use_replica', False)
+
+
+def pinned_to_primary():
+    """Whether this request's client wrote recently and must see its own writes"""
+    return has_app_context() and g.get('pinned_to_primary', False)
+
+
+class RoutingSession(Session):
+    """Session that sends reads to the replica while a read-only view runs"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (bind is None and reads_from_replica()
+                and not self._flushing
+                and not (self.new or self.dirty or self.deleted)):
+            replica = self._db.engines.get(REPLICA_BIND)
+            if replica is not None:
+                return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def init_replica_routing(app):
+    """Decide per request whether reads may go to the replica"""
+
+    @app.before_request
+    def _route_reads():
+        g.use_replica = False
+        g.pinned_to_primary = False
+        if not app.config.get('SQLALCHEMY_REPLICA_URI'):
+            return
+
+        if request.method not in ('GET', 'HEAD'):
+            # Read-your-writes: pin this client to the primary for a while
+            session[_STICKY_SESSION_KEY] = time.time() + app.config['REPLICA_STICKY_SECONDS']
+            g.pinned_to_primary = True
+            return
+
+        g.pinned_to_primary = session.get(_STICKY_SESSION_KEY, 0) >= time.time()
+        view = app.view_functions.get(request.endpoint)
+        if getattr(view, 'use_replica', False) and not g.pinned_to_primary:
+            g.use_replica = True
@@ -0,0 +1,16 @@
+"""
+Flask extension instances for Job Portal
+
+Extensions are created unbound here and attached to the application in
+``create_app()``, so models and blueprints can import them without importing
+the application itself.
+"""
+from flask_login import LoginManager
+from flask_sqlalchemy import SQLAlchemy
+
+from database import RoutingSession
+
+db = SQLAlchemy(session_options={'class_': RoutingSession})
+
+login_manager = LoginManager()
+login_manager.login_view = 'auth.login'
@@ -0,0 +1,281 @@
+"""
+Location normalization and radius search for jobs
+
+Free-text job locations ("San Francisco, CA", "SF", "Remote (US)",
+"Hybrid - Bay Area") are parsed against the offline gazetteer in
+data/gazetteer.csv and stored as rows of the ``Location`` table with
+coordinates, a geohash and remote/hybrid flags. Each job points at its
+normalized location through ``Job.location_id``.
+
+A radius search ("within 50 km of Austin") becomes an indexed range scan on
+``Location.geohash`` over the 3x3 block of cells around the centre, followed
+by an exact great-circle check on the handful of candidate locations.
+"""
+import csv
+import math
+import os
+import re
+from collections import namedtuple
+
+from flask import has_app_context
+from sqlalchemy import and_, or_
+
+from database import insert_ignoring_conflicts
+from extensions import db
+from models import Job, Location
+from signals import jobs_changed
+
+GAZETTEER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'gazetteer.csv')
+EARTH_RADIUS_KM = 6371.0
+GEOHASH_PRECISION = 9
+_BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+_ID_CHUNK_SIZE = 500
+
+Place = namedtuple('Place', 'name region country latitude longitude')
+ParsedLocation = namedtuple('ParsedLocation', 'label place is_remote is_hybrid country')
+
+
+# Geohash
+
+def geohash_encode(latitude, longitude, precision=GEOHASH_PRECISION):
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, char, bit, even = [], 0, 0, True
+    while len(chars) < precision:
+        value, bounds = (longitude, lon_range) if even else (latitude, lat_range)
+        mid = (bounds[0] + bounds[1]) / 2
+        if value >= mid:
+            char |= 1 << (4 - bit)
+            bounds[0] = mid
+        else:
+            bounds[1] = mid
+        even = not even
+        if bit < 4:
+            bit += 1
+        else:
+            chars.append(_BASE32[char])
+            char, bit = 0, 0
+    return ''.join(chars)
+
+
+def _cell_size_degrees(precision):
+    lat_bits = (5 * precision) // 2
+    lon_bits = 5 * precision - lat_bits
+    return 180.0 / 2 ** lat_bits, 360.0 / 2 ** lon_bits
+
+
+def covering_cells(latitude, longitude, radius_km):
+    """Geohash prefixes whose cells together cover the circle, or None for 'everywhere'"""
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        height, width = _cell_size_degrees(precision)
+        height_km = height * 111.32
+        width_km = width * 111.32 * max(math.cos(math.radians(latitude)), 0.01)
+        if height_km >= radius_km and width_km >= radius_km:
+            break
+    else:
+        return None
+
+    cells = set()
+    for d_lat in (-1, 0, 1):
+        for d_lon in (-1, 0, 1):
+            lat = min(max(latitude + d_lat * height, -89.999999), 89.999999)
+            lon = (longitude + d_lon * width + 180.0) % 360.0 - 180.0
+            cells.add(geohash_encode(lat, lon, precision))
+    return sorted(cells)
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    d_lat = math.radians(lat2 - lat1)
+    d_lon = math.radians(lon2 - lon1)
+    a = (math.sin(d_lat / 2) ** 2 +
+         math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(d_lon / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+# Gazetteer and parsing
+
+class Gazetteer:
+    """Offline lookup of place names and aliases to coordinates"""
+
+    def __init__(self, places):
+        self._by_key = {}
+        for place, aliases in places:
+            keys = [place.name.lower()]
+            if place.region:
+                keys.insert(0, f'{place.name}, {place.region}'.lower())
+            keys.append(f'{place.name}, {place.country}'.lower())
+            keys.extend(alias.strip().lower() for alias in aliases if alias.strip())
+            for key in keys:
+                # The first (most populous) place wins for ambiguous names
+                self._by_key.setdefault(key, place)
+
+    @classmethod
+    def load(cls, path=GAZETTEER_PATH):
+        places = []
+        with open(path, newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                place = Place(row['name'], row['region'] or None, row['country'],
+                              float(row['latitude']), float(row['longitude']))
+                places.append((place, (row['aliases'] or '').split('|')))
+        return cls(places)
+
+    def resolve(self, text):
+        """Return the Place for ``text`` ('Austin, TX', 'Austin', 'ATX'), or None"""
+        key = re.sub(r'\s+', ' ', text.strip().lower().rstrip('.,'))
+        if not key:
+            return None
+        place = self._by_key.get(key)
+        if place is not None:
+            return place
+
+        # 'Austin, Texas' / 'Portland, ME': match the city, but only if the
+        # qualifier doesn't contradict the place we found
+        name, _, qualifier = key.partition(',')
+        place = self._by_key.get(name.strip())
+        if place is None:
+            return None
+        qualifier = qualifier.strip()
+        if qualifier and qualifier not in ((place.region or '').lower(), place.country.lower()) \
+                and len(qualifier) <= 3:
+            return None
+        return place
+
+
+_gazetteer = None
+
+
+def get_gazetteer():
+    global _gazetteer
+    if _gazetteer is None:
+        _gazetteer = Gazetteer.load()
+    return _gazetteer
+
+
+def place_label(place):
+    return f'{place.name}, {place.region or place.country}'
+
+
+def parse_location(text, gazetteer=None):
+    """Split free text into a gazetteer place plus remote/hybrid flags"""
+    gazetteer = gazetteer or get_gazetteer()
+    original = re.sub(r'\s+', ' ', (text or '').strip())
+    lowered = original.lower()
+    is_remote = 'remote' in lowered
+    is_hybrid = 'hybrid' in lowered
+
+    country = None
+    match = re.search(r'\(([a-z]{2,3})\)', lowered)
+    if match:
+        country = match.group(1).upper()
+
+    rest = re.sub(r'\([^)]*\)', ' ', lowered)
+    rest = re.sub(r'\b(remote|hybrid|on-?site|anywhere)\b', ' ', rest)
+    rest = re.sub(r'\s*[-–/|]\s*', ' ', rest).strip(' ,.')
+    place = gazetteer.resolve(rest) if rest else None
+
+    if place is not None:
+        label = place_label(place)
+        country = place.country
+    elif rest:
+        label = original  # unknown place: keep the text as written
+    else:
+        label = ''
+
+    if is_remote:
+        label = f'Remote - {label}' if label else (f'Remote ({country})' if country else 'Remote')
+    elif is_hybrid and place is not None:
+        label = f'Hybrid - {label}'
+    return ParsedLocation(label or original, place, is_remote, is_hybrid, country)
+
+
+# Database
+
+def get_or_create_location(parsed):
+    """Return the Location for ``parsed``, creating it if needed
+
+    Jobs are often posted concurrently for the same new city, so the row is
+    inserted with ON CONFLICT DO NOTHING on its unique label and then read
+    back, whichever request created it.
+    """
+    location = Location.query.filter_by(label=parsed.label).first()
+    if location is not None:
+        return location
+
+    place = parsed.place
+    db.session.execute(insert_ignoring_conflicts(db, Location).values(
+        label=parsed.label,
+        city=place.name if place else None,
+        region=place.region if place else None,
+        country=parsed.country,
+        latitude=place.latitude if place else None,
+        longitude=place.longitude if place else None,
+        geohash=geohash_encode(place.latitude, place.longitude) if place else None,
+        is_remote=parsed.is_remote,
+        is_hybrid=parsed.is_hybrid,
+    ))
+    return Location.query.filter_by(label=parsed.label).one()
+
+
+def assign_locations(job_ids=None, active_only=False):
+    """Normalize the location of the given jobs (all jobs when None)
+
+    Jobs are grouped by their location text so each distinct string is parsed
+    and looked up once, then updated with one UPDATE per group.
+    """
+    query = db.session.query(Job.id, Job.location)
+    if active_only:
+        query = query.filter(Job.status == 'active')
+    if job_ids is not None:
+        job_ids = list(job_ids)
+        chunks = [job_ids[i:i + _ID_CHUNK_SIZE] for i in range(0, len(job_ids), _ID_CHUNK_SIZE)]
+        rows = [row for chunk in chunks for row in query.filter(Job.id.in_(chunk))]
+    else:
+        rows = query.all()
+    if not rows:
+        return 0
+
+    by_text = {}
+    for job_id, text in rows:
+        by_text.setdefault(text or '', []).append(job_id)
+
+    for text, ids in by_text.items():
+        location_id = get_or_create_location(parse_location(text)).id if text.strip() else None
+        for i in range(0, len(ids), _ID_CHUNK_SIZE):
+            db.session.query(Job).filter(Job.id.in_(ids[i:i + _ID_CHUNK_SIZE])).update(
+                {Job.location_id: location_id}, synchronize_session=False
+            )
+    db.session.commit()
+    return len(rows)
+
+
+def location_ids_within(latitude, longitude, radius_km):
+    """Ids of locations within ``radius_km`` of a point, via the geohash index"""
+    query = db.session.query(Location.id, Location.latitude, Location.longitude).filter(
+        Location.geohash.isnot(None)
+    )
+    cells = covering_cells(latitude, longitude, radius_km)
+    if cells is not None:
+        # Prefix match as a range so it can use the index on every database
+        query = query.filter(or_(*(
+            and_(Location.geohash >= cell, Location.geohash < cell + '{') for cell in cells
+        )))
+    return [
+        location_id for location_id, lat, lon in query
+        if haversine_km(latitude, longitude, lat, lon) <= radius_km
+    ]
+
+
+def location_ids_for_place(place):
+    """Ids of locations in the same city as ``place`` (on-site, hybrid or remote-from)"""
+    return [
+        location_id for (location_id,) in
+        db.session.query(Location.id).filter_by(city=place.name, region=place.region)
+    ]
+
+
+@jobs_changed.connect
+def _on_jobs_changed(sender, job_ids=None, **extra):
+    # Broad changes (job_ids=None) are left to `flask normalize-locations`.
+    # Only jobs still active need a location: deleted jobs are gone and
+    # archived ones are out of search, so deletes and sweeps cost one SELECT.
+    if has_app_context() and job_ids is not None:
+        assign_locations(job_ids, active_only=True)
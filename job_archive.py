@@ -0,0 +1,166 @@
+"""
+Job expiry and archival
+
+A sweep does two things:
+
+1. Expire: active jobs older than ``JOB_EXPIRY_DAYS`` are closed.
+2. Archive: jobs closed more than ``JOB_ARCHIVE_AFTER_DAYS`` ago are copied,
+   with their applications, into the ``archived_job`` and
+   ``archived_application`` tables with INSERT ... SELECT and removed from
+   the hot tables, ``JOB_SWEEP_BATCH_SIZE`` jobs per transaction.
+
+That keeps the ``job`` table (scanned by every ``/jobs`` query) down to the
+live working set. Recruiters and admins can still browse archived jobs and
+their applications.
+
+Sweeps run from cron with ``flask --app app sweep-jobs``, or every
+``JOB_SWEEP_INTERVAL_SECONDS`` in a background thread of each worker process.
+Concurrent sweeps are safe: each batch locks its job rows first, so a job
+another process is archiving is skipped once that process commits, and a
+batch that still collides fails its INSERT, is rolled back and ends that
+sweep. Jobs only take applications while active, and the lock holds off
+any that were already in flight.
+"""
+import random
+import time
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import func, literal
+from sqlalchemy.exc import IntegrityError
+
+from background import BackgroundThread
+from extensions import db
+from models import Application, ArchivedApplication, ArchivedJob, Job, SavedJob
+from signals import jobs_changed
+
+_ARCHIVED_JOB_COLUMNS = (
+    'id', 'title', 'company', 'location', 'job_type', 'experience', 'salary', 'skills',
+    'description', 'requirements', 'status', 'recruiter_id', 'created_at', 'location_id', 'closed_at',
+)
+_ARCHIVED_APPLICATION_COLUMNS = (
+    'id', 'job_id', 'user_id', 'cover_letter', 'resume_url', 'status', 'applied_at', 'updated_at',
+)
+
+
+def expire_jobs(max_age_days, now=None):
+    """Close active jobs posted more than ``max_age_days`` ago; return their ids"""
+    now = now or datetime.utcnow()
+    job_ids = [job_id for (job_id,) in db.session.query(Job.id).filter(
+        Job.status == 'active',
+        Job.deleted_at.is_(None),
+        Job.created_at < now - timedelta(days=max_age_days),
+    )]
+    if job_ids:
+        db.session.query(Job).filter(Job.id.in_(job_ids), Job.status == 'active').update(
+            {Job.status: 'closed', Job.closed_at: now}, synchronize_session=False
+        )
+        db.session.commit()
+    return job_ids
+
+
+def _archive_batch(job_ids, now):
+    """Copy ``job_ids`` and their applications to the archive and delete them; return the ids moved"""
+    # Lock the jobs before copying. On PostgreSQL an application inserted
+    # meanwhile waits on the lock (its foreign key check shares the job row)
+    # and then fails, rather than committing between the copy and the delete
+    # and being deleted without an archived copy.
+    job_ids = [job_id for (job_id,) in db.session.query(Job.id).filter(
+        Job.id.in_(job_ids), Job.status == 'closed', Job.deleted_at.is_(None)
+    ).order_by(Job.id).with_for_update()]
+    if not job_ids:
+        return job_ids
+    job_columns = [getattr(Job, name) for name in _ARCHIVED_JOB_COLUMNS]
+    db.session.execute(
+        db.insert(ArchivedJob).from_select(
+            list(_ARCHIVED_JOB_COLUMNS) + ['archived_at'],
+            db.select(*job_columns, literal(now)).where(Job.id.in_(job_ids)),
+        )
+    )
+    application_columns = [getattr(Application, name) for name in _ARCHIVED_APPLICATION_COLUMNS]
+    db.session.execute(
+        db.insert(ArchivedApplication).from_select(
+            list(_ARCHIVED_APPLICATION_COLUMNS),
+            db.select(*application_columns).where(Application.job_id.in_(job_ids)),
+        )
+    )
+    for model in (Application, SavedJob):
+        db.session.query(model).filter(model.job_id.in_(job_ids)).delete(synchronize_session=False)
+    db.session.query(Job).filter(Job.id.in_(job_ids)).delete(synchronize_session=False)
+    return job_ids
+
+
+def archive_jobs(closed_days, batch_size=500, now=None):
+    """Move jobs closed more than ``closed_days`` ago to the archive; return their ids"""
+    now = now or datetime.utcnow()
+    # Jobs closed before closed_at existed count from their posting date
+    closed_since = func.coalesce(Job.closed_at, Job.created_at)
+    archived = []
+    while True:
+        job_ids = [job_id for (job_id,) in db.session.query(Job.id).filter(
+            Job.status == 'closed',
+            Job.deleted_at.is_(None),
+            closed_since < now - timedelta(days=closed_days),
+        ).order_by(Job.id).limit(batch_size)]
+        if not job_ids:
+            return archived
+        try:
+            job_ids = _archive_batch(job_ids, now)
+            db.session.commit()
+        except IntegrityError:
+            # Another process is archiving the same jobs; leave the rest to it
+            db.session.rollback()
+            current_app.logger.info('Job archive batch already archived elsewhere, stopping')
+            return archived
+        archived.extend(job_ids)
+
+
+def application_counts(archived_jobs):
+    """Number of archived applications per archived job id, in one grouped COUNT"""
+    job_ids = [job.id for job in archived_jobs]
+    if not job_ids:
+        return {}
+    return dict(
+        db.session.query(ArchivedApplication.job_id, func.count(ArchivedApplication.id))
+        .filter(ArchivedApplication.job_id.in_(job_ids))
+        .group_by(ArchivedApplication.job_id)
+    )
+
+
+def sweep_jobs(app_config, now=None):
+    """Expire and archive jobs per the JOB_* settings; return (expired, archived)"""
+    expired, archived = [], []
+    if app_config['JOB_EXPIRY_DAYS']:
+        expired = expire_jobs(app_config['JOB_EXPIRY_DAYS'], now)
+    if app_config['JOB_ARCHIVE_AFTER_DAYS'] is not None:
+        archived = archive_jobs(app_config['JOB_ARCHIVE_AFTER_DAYS'], app_config['JOB_SWEEP_BATCH_SIZE'], now)
+    changed = sorted(set(expired) | set(archived))
+    if changed:
+        jobs_changed.send(Job, job_ids=changed)
+    return expired, archived
+
+
+class Sweeper(BackgroundThread):
+    """Per-process daemon thread running sweep_jobs() on an interval"""
+
+    name = 'job-sweeper'
+
+    def run(self):
+        interval = self.app.config['JOB_SWEEP_INTERVAL_SECONDS']
+        # Spread workers out so they don't all sweep at the same moment
+        time.sleep(random.uniform(0, min(interval, 60)))
+        while True:
+            self.call(self._sweep, failure='Job sweep failed')
+            time.sleep(interval)
+
+    def _sweep(self):
+        expired, archived = sweep_jobs(self.app.config)
+        if expired or archived:
+            self.app.logger.info('Job sweep: expired %d, archived %d', len(expired), len(archived))
+
+
+def init_app(app):
+    if not app.config['JOB_SWEEP_INTERVAL_SECONDS']:
+        return
+    sweeper = app.extensions['job_sweeper'] = Sweeper(app)
+    sweeper.start_before_requests()
@@ -0,0 +1,108 @@
+"""
+Soft deletion and background purging of jobs
+
+Deleting a job only marks it (``status='deleted'`` and ``deleted_at``), which
+hides it everywhere at once and keeps the recruiter's request short. The
+job's applications and saved-job rows are then removed by a background thread
+in batches of ``JOB_PURGE_BATCH_SIZE``, each in its own short transaction, so
+a job with tens of thousands of applicants never holds a long lock. The job
+row itself goes last.
+
+The thread is started lazily in each worker process. If a process exits
+before finishing, ``flask --app app purge-jobs`` (or the next worker thread
+to start) picks up every job still waiting to be purged.
+"""
+import queue
+import time
+from datetime import datetime
+
+from background import BackgroundThread
+from extensions import db
+from models import Application, ApplicationDailyStat, Job, SavedJob
+
+_SWEEP = object()  # queue marker: purge every soft-deleted job
+
+
+def soft_delete_job(job):
+    job.status = 'deleted'
+    job.deleted_at = datetime.utcnow()
+
+
+def _delete_in_batches(model, job_id, batch_size, pause):
+    deleted = 0
+    while True:
+        ids = [row_id for (row_id,) in
+               db.session.query(model.id).filter(model.job_id == job_id).limit(batch_size)]
+        if not ids:
+            return deleted
+        db.session.query(model).filter(model.id.in_(ids)).delete(synchronize_session=False)
+        db.session.commit()
+        deleted += len(ids)
+        if pause:
+            time.sleep(pause)
+
+
+def purge_job(job_id, batch_size=1000, pause=0):
+    """Delete a soft-deleted job and its dependents; return rows removed"""
+    deleted = _delete_in_batches(Application, job_id, batch_size, pause)
+    deleted += _delete_in_batches(SavedJob, job_id, batch_size, pause)
+    # At most one rollup row per day and status, small enough for one statement
+    deleted += db.session.query(ApplicationDailyStat).filter(
+        ApplicationDailyStat.job_id == job_id
+    ).delete(synchronize_session=False)
+    deleted += db.session.query(Job).filter(
+        Job.id == job_id, Job.deleted_at.isnot(None)
+    ).delete(synchronize_session=False)
+    db.session.commit()
+    return deleted
+
+
+def pending_job_ids():
+    return [job_id for (job_id,) in
+            db.session.query(Job.id).filter(Job.deleted_at.isnot(None)).order_by(Job.deleted_at)]
+
+
+def purge_deleted_jobs(batch_size=1000, pause=0):
+    """Purge every soft-deleted job; return (jobs purged, rows removed)"""
+    job_ids = pending_job_ids()
+    rows = sum(purge_job(job_id, batch_size, pause) for job_id in job_ids)
+    return len(job_ids), rows
+
+
+class PurgeWorker(BackgroundThread):
+    """Per-process daemon thread that purges jobs queued by schedule()"""
+
+    name = 'job-purge'
+
+    def schedule(self, job_id):
+        self.ensure_started()
+        self._queue.put(job_id)
+
+    def starting(self):
+        self._queue = queue.Queue()
+        self._queue.put(_SWEEP)  # catch up on anything a previous process left behind
+
+    def run(self):
+        config = self.app.config
+        batch_size = config['JOB_PURGE_BATCH_SIZE']
+        pause = config['JOB_PURGE_BATCH_PAUSE_MS'] / 1000
+        while True:
+            item = self._queue.get()
+            if item is _SWEEP:
+                self.call(purge_deleted_jobs, batch_size, pause, failure='Purging deleted jobs failed')
+            else:
+                self.call(purge_job, item, batch_size, pause, failure=f'Purging deleted job {item} failed')
+
+
+def delete_job(app, job):
+    """Soft-delete ``job`` now and purge it in the background when enabled"""
+    soft_delete_job(job)
+    db.session.commit()
+    worker = app.extensions.get('job_purge')
+    if worker is not None:
+        worker.schedule(job.id)
+
+
+def init_app(app):
+    if app.config['JOB_PURGE_IN_BACKGROUND']:
+        app.extensions['job_purge'] = PurgeWorker(app)
@@ -0,0 +1,150 @@
+"""
+Live application events for recruiters over server-sent events
+
+Recruiter pages open ``/recruiter/events`` with ``EventSource``. The stream
+subscribes to the recruiter's job ids on an in-process broker and forwards
+``application`` (someone applied) and ``status`` (an application's status
+changed) events as they are published, so pages update in place instead of
+being reloaded.
+
+Each open stream holds a worker thread or greenlet, so serve the app with
+an async-capable worker (``gunicorn -k gevent`` or ``-k gthread --threads N``).
+At most ``SSE_MAX_STREAMS`` streams are open per process, so they can't take
+every thread; pages beyond that get an empty stream that tells the browser
+to try again in about ``SSE_BUSY_RETRY_SECONDS``. Streams close after
+``SSE_MAX_SECONDS`` and the browser reconnects on its own, so no worker is
+held forever.
+
+The broker only sees events published in its own process, so live updates
+need a single worker process. The app refuses to start with them enabled
+when ``WEB_CONCURRENCY``, ``GUNICORN_CMD_ARGS`` or the gunicorn/uvicorn
+command line (``-w``/``--workers``) asks for more, rather than silently
+losing events; set ``LIVE_EVENTS_ENABLED=False`` to run several workers.
+Swap ``Broker`` for a shared pub/sub such as Redis to lift that limit.
+"""
+import json
+import os
+import queue
+import random
+import shlex
+import sys
+import threading
+import time
+
+from flask import current_app, has_app_context
+
+
+class Subscription:
+    def __init__(self, job_ids, queue_size):
+        self.job_ids = frozenset(job_ids)
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.overflowed = False
+
+
+class Broker:
+    """In-process pub/sub keyed by job id"""
+
+    def __init__(self, queue_size=100, max_subscriptions=None):
+        self.queue_size = queue_size
+        self.max_subscriptions = max_subscriptions
+        self._lock = threading.Lock()
+        self._subscriptions = set()
+
+    def subscribe(self, job_ids):
+        """Return a new Subscription, or None if ``max_subscriptions`` are open"""
+        subscription = Subscription(job_ids, self.queue_size)
+        with self._lock:
+            if self.max_subscriptions is not None and len(self._subscriptions) >= self.max_subscriptions:
+                return None
+            self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+    def publish(self, job_id, event, data):
+        with self._lock:
+            subscriptions = [s for s in self._subscriptions if job_id in s.job_ids]
+        for subscription in subscriptions:
+            try:
+                subscription.queue.put_nowait((event, data))
+            except queue.Full:
+                # A client that stopped reading is told to reload once it catches up
+                subscription.overflowed = True
+
+
+def publish(job_id, event, data):
+    """Send an event to recruiters watching ``job_id``; call after committing"""
+    if not has_app_context():
+        return
+    broker = current_app.extensions.get('live_events')
+    if broker is not None:
+        broker.publish(job_id, event, data)
+
+
+def format_event(event, data):
+    return f'event: {event}\ndata: {json.dumps(data)}\n\n'
+
+
+def busy_response_body(retry_seconds):
+    """An SSE body that only asks the browser to reconnect later, jittered so pages don't return together"""
+    return f'retry: {int(retry_seconds * random.uniform(0.5, 1.5) * 1000)}\n\n'
+
+
+def stream(broker, subscription, keepalive_seconds, max_seconds):
+    """Yield SSE messages for ``subscription`` until ``max_seconds`` pass"""
+    deadline = time.monotonic() + max_seconds
+    try:
+        # Reconnect quickly after the server closes the stream on purpose
+        yield 'retry: 2000\n\n'
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            try:
+                event, data = subscription.queue.get(timeout=min(keepalive_seconds, remaining))
+            except queue.Empty:
+                yield ': keepalive\n\n'
+                continue
+            yield format_event(event, data)
+            if subscription.overflowed and subscription.queue.empty():
+                yield format_event('reset', {})
+                return
+    finally:
+        broker.unsubscribe(subscription)
+
+
+def requested_workers(argv=None, environ=None):
+    """Worker processes asked for through the environment or a gunicorn/uvicorn command line"""
+    argv = sys.argv if argv is None else argv
+    environ = os.environ if environ is None else environ
+    workers = int(environ.get('WEB_CONCURRENCY') or 1)
+    if not argv or not any(server in argv[0] for server in ('gunicorn', 'uvicorn')):
+        return workers
+    # Later options win, as in gunicorn: GUNICORN_CMD_ARGS, then the command line
+    args = shlex.split(environ.get('GUNICORN_CMD_ARGS', '')) + list(argv[1:])
+    for i, arg in enumerate(args):
+        if arg in ('-w', '--workers'):
+            value = args[i + 1] if i + 1 < len(args) else ''
+        elif arg.startswith('--workers='):
+            value = arg.partition('=')[2]
+        elif arg.startswith('-w'):
+            value = arg[2:]
+        else:
+            continue
+        if value.isdigit():
+            workers = int(value)
+    return workers
+
+
+def init_app(app):
+    if not app.config['LIVE_EVENTS_ENABLED']:
+        return
+    workers = requested_workers()
+    if workers > 1:
+        raise RuntimeError(
+            f'Live events need a single worker process, but {workers} workers were requested: events '
+            'only reach streams in the same process. Serve with one worker or set LIVE_EVENTS_ENABLED=False.'
+        )
+    app.extensions['live_events'] = Broker(app.config['SSE_QUEUE_SIZE'], app.config['SSE_MAX_STREAMS'] or None)
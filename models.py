@@ -0,0 +1,190 @@
+"""
+Database models for Job Portal
+"""
+from datetime import datetime
+
+from flask_login import UserMixin
+from werkzeug.security import generate_password_hash, check_password_hash
+
+from extensions import db, login_manager
+
+class User(UserMixin, db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    username = db.Column(db.String(80), unique=True, nullable=False)
+    email = db.Column(db.String(120), unique=True, nullable=False)
+    password_hash = db.Column(db.String(200), nullable=False)
+    role = db.Column(db.String(20), nullable=False)  # 'job_seeker', 'recruiter', 'admin'
+    full_name = db.Column(db.String(100))
+    phone = db.Column(db.String(20))
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def set_password(self, password):
+        self.password_hash = generate_password_hash(password)
+    
+    def check_password(self, password):
+        return check_password_hash(self.password_hash, password)
+
+class Job(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    title = db.Column(db.String(200), nullable=False)
+    company = db.Column(db.String(200), nullable=False)
+    location = db.Column(db.String(200), nullable=False)
+    job_type = db.Column(db.String(50))  # 'full-time', 'part-time', 'contract'
+    experience = db.Column(db.String(50))
+    salary = db.Column(db.String(100))
+    skills = db.Column(db.Text)
+    description = db.Column(db.Text, nullable=False)
+    requirements = db.Column(db.Text)
+    status = db.Column(db.String(20), default='active')  # 'active', 'closed', 'deleted'
+    recruiter_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # Normalized form of `location`, filled in from the gazetteer (see geo.py)
+    location_id = db.Column(db.Integer, db.ForeignKey('location.id'), index=True)
+    # Set when the job is deleted; the row is purged in the background (see job_purge.py)
+    deleted_at = db.Column(db.DateTime, index=True)
+    # Set when the job expires; closed jobs are moved to ArchivedJob later (see job_archive.py)
+    closed_at = db.Column(db.DateTime)
+    
+    place = db.relationship('Location')
+    
+    __table_args__ = (
+        # Covers the active listing (status filter, newest first) on its own
+        db.Index('ix_job_status_created_at', 'status', 'created_at', 'id'),
+    )
+
+class Location(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    label = db.Column(db.String(200), unique=True, nullable=False)  # e.g. 'Austin, TX', 'Remote (US)'
+    city = db.Column(db.String(100))
+    region = db.Column(db.String(50))
+    country = db.Column(db.String(2))
+    latitude = db.Column(db.Float)
+    longitude = db.Column(db.Float)
+    geohash = db.Column(db.String(12), index=True)
+    is_remote = db.Column(db.Boolean, default=False, nullable=False, index=True)
+    is_hybrid = db.Column(db.Boolean, default=False, nullable=False)
+    
+    __table_args__ = (
+        db.Index('ix_location_city_region', 'city', 'region'),
+    )
+
+class SavedJob(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    job_id = db.Column(db.Integer, db.ForeignKey('job.id', ondelete='CASCADE'), nullable=False, index=True)
+    saved_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    user = db.relationship('User', backref=db.backref('saved_jobs', lazy=True, cascade='all, delete-orphan'))
+    job = db.relationship('Job', backref=db.backref('saved_by', lazy=True, cascade='all, delete-orphan', passive_deletes=True))
+    
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'job_id', name='unique_user_job'),
+    )
+
+class Application(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    job_id = db.Column(db.Integer, db.ForeignKey('job.id', ondelete='CASCADE'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    cover_letter = db.Column(db.Text)
+    resume_url = db.Column(db.String(500))
+    status = db.Column(db.String(20), default='pending')  # pending, reviewed, accepted, rejected
+    applied_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Client-generated key of the submit that created this application, so a
+    # retried or double-clicked submit is recognised as the same request
+    idempotency_key = db.Column(db.String(64))
+    
+    __table_args__ = (
+        # A unique index (not a constraint) so init-db can add it to existing databases
+        db.Index('uq_application_job_user', 'job_id', 'user_id', unique=True),
+    )
+
+class ApplicationDailyStat(db.Model):
+    """Per job, per day, per status counts of applications entering that status
+
+    Maintained incrementally by analytics.py. Not a foreign key to job, so the
+    numbers survive archival.
+    """
+    job_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    day = db.Column(db.Date, primary_key=True)
+    status = db.Column(db.String(20), primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+    # Of those, how many were the first review (left 'pending'), and the total
+    # seconds they waited since applying
+    reviewed_count = db.Column(db.Integer, nullable=False, default=0)
+    review_seconds = db.Column(db.Float, nullable=False, default=0)
+
+class ArchivedJob(db.Model):
+    """A closed job moved out of the hot job table; keeps its original id"""
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    title = db.Column(db.String(200), nullable=False)
+    company = db.Column(db.String(200), nullable=False)
+    location = db.Column(db.String(200), nullable=False)
+    job_type = db.Column(db.String(50))
+    experience = db.Column(db.String(50))
+    salary = db.Column(db.String(100))
+    skills = db.Column(db.Text)
+    description = db.Column(db.Text, nullable=False)
+    requirements = db.Column(db.Text)
+    status = db.Column(db.String(20))
+    recruiter_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
+    created_at = db.Column(db.DateTime)
+    location_id = db.Column(db.Integer, db.ForeignKey('location.id'))
+    closed_at = db.Column(db.DateTime)
+    archived_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    
+    recruiter = db.relationship('User')
+    applications = db.relationship('ArchivedApplication', backref='job', lazy='dynamic')
+
+class ArchivedApplication(db.Model):
+    """An application to an archived job; keeps its original id"""
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    job_id = db.Column(db.Integer, db.ForeignKey('archived_job.id', ondelete='CASCADE'), nullable=False, index=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
+    cover_letter = db.Column(db.Text)
+    resume_url = db.Column(db.String(500))
+    status = db.Column(db.String(20))
+    applied_at = db.Column(db.DateTime)
+    updated_at = db.Column(db.DateTime)
+    
+    applicant = db.relationship('User')
+
+class SearchQueryStat(db.Model):
+    """How often a normalized job search was run per day, for cache warming (search_cache.py)"""
+    params = db.Column(db.String(500), primary_key=True)  # SearchKey as sorted JSON
+    day = db.Column(db.Date, primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+class RequestProfile(db.Model):
+    """Sampled call stacks and SQL of one request profiled by an admin (profiling.py)"""
+    id = db.Column(db.Integer, primary_key=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='SET NULL'))
+    method = db.Column(db.String(10))
+    path = db.Column(db.String(2000))
+    endpoint = db.Column(db.String(100))
+    status_code = db.Column(db.Integer)
+    duration_ms = db.Column(db.Float)
+    sample_count = db.Column(db.Integer)
+    query_count = db.Column(db.Integer)
+    query_ms = db.Column(db.Float)
+    stacks = db.Column(db.Text)  # collapsed stacks, one "frame;frame;frame count" per line
+    queries = db.Column(db.Text)  # JSON list of {"sql": ..., "ms": ...}
+    
+    user = db.relationship('User')
+
+# Set up relationships after all models are defined
+User.jobs_posted = db.relationship('Job', backref='recruiter', lazy=True, foreign_keys='Job.recruiter_id')
+User.applications = db.relationship('Application', backref='applicant', lazy=True)
+
+# passive_deletes: rows are removed by the database's ON DELETE CASCADE (or in
+# batches by job_purge.py) instead of being loaded and deleted one by one
+Job.applications = db.relationship('Application', backref='job', lazy=True, cascade='all, delete-orphan', passive_deletes=True)
+
+def get_job_or_404(job_id):
+    """Return a job that has not been deleted, or abort with 404"""
+    return Job.query.filter(Job.id == job_id, Job.deleted_at.is_(None)).first_or_404()
+
+@login_manager.user_loader
+def load_user(user_id):
+    return User.query.get(int(user_id))
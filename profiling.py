@@ -0,0 +1,222 @@
+"""
+On-demand sampling profiler for single requests
+
+An admin adds ``?_profile=1`` to a URL (or sends an ``X-Profile: 1``
+header) to profile that one request on live data. While the view runs, a
+helper thread samples the request thread's call stack every
+``PROFILER_INTERVAL_MS`` and counts identical stacks. Every SQL statement
+run during the request is also recorded with its duration. The result is
+saved as a ``RequestProfile`` row, which the response names in its
+``X-Profile-Id`` header. Admins browse saved profiles at ``/admin/profiles``.
+
+Stacks are stored in the collapsed format (``frame;frame;frame count`` per
+line) read by flamegraph.pl and speedscope. Requests without the trigger
+only pay for a look at the query string and headers, plus a check per SQL
+statement. Statement parameters are not stored. Only the request's own
+thread is sampled: under the async views (asgi.py) the queries show up but
+the time spent waiting on them does not.
+"""
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from functools import lru_cache
+
+from flask import current_app, g, has_request_context, request
+from flask_login import current_user
+from sqlalchemy import event
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from extensions import db
+from models import RequestProfile
+
+_STARTED_KEY = '_profile_query_started'
+
+
+@lru_cache(maxsize=4096)
+def _short_path(filename):
+    """Show files relative to the app or their sys.path entry"""
+    roots = sorted((os.path.join(os.path.abspath(path), '') for path in sys.path if path), key=len, reverse=True)
+    for root in roots:
+        if filename.startswith(root):
+            return filename[len(root):]
+    return filename
+
+
+def _frame_label(frame):
+    code = frame.f_code
+    return f'{code.co_name} ({_short_path(code.co_filename)}:{code.co_firstlineno})'
+
+
+class Profile:
+    """Samples one thread's stack on a helper thread and collects SQL"""
+
+    def __init__(self, thread_id, interval, max_queries):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.max_queries = max_queries
+        self.stacks = Counter()
+        self.queries = []
+        self.dropped_queries = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='request-profiler', daemon=True)
+
+    def start(self):
+        self.started = time.perf_counter()
+        self._thread.start()
+
+    def stop(self):
+        if not self._stop.is_set():
+            self._stop.set()
+            self._thread.join()
+            self.duration = time.perf_counter() - self.started
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            labels = []
+            while frame is not None:
+                labels.append(_frame_label(frame))
+                frame = frame.f_back
+            if labels:
+                self.stacks[';'.join(reversed(labels))] += 1
+
+    def add_query(self, statement, seconds):
+        if len(self.queries) < self.max_queries:
+            self.queries.append({'sql': statement, 'ms': round(seconds * 1000, 3)})
+        else:
+            self.dropped_queries += 1
+
+    def collapsed(self):
+        return '\n'.join(f'{stack} {count}' for stack, count in self.stacks.most_common())
+
+
+def _active_profile():
+    return g.get('_profile') if has_request_context() else None
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _active_profile() is not None:
+        conn.info.setdefault(_STARTED_KEY, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _active_profile()
+    started = conn.info.get(_STARTED_KEY)
+    if profile is not None and started:
+        profile.add_query(statement, time.perf_counter() - started.pop())
+
+
+def _start_profile():
+    if not (request.args.get('_profile') or request.headers.get('X-Profile')):
+        return
+    if not (current_user.is_authenticated and current_user.role == 'admin'):
+        return
+    config = current_app.config
+    g._profile = Profile(threading.get_ident(), config['PROFILER_INTERVAL_MS'] / 1000, config['PROFILER_MAX_QUERIES'])
+    g._profile.start()
+
+
+def _finish_profile(response):
+    profile = g.pop('_profile', None)
+    if profile is None:
+        return response
+    profile.stop()
+    try:
+        profile_id = save_profile(profile, response.status_code)
+    except SQLAlchemyError:
+        current_app.logger.exception('Saving the profile of %s failed', request.path)
+        return response
+    response.headers['X-Profile-Id'] = str(profile_id)
+    return response
+
+
+def _discard_profile(exc):
+    # Only reached with a live profile if after_request never ran
+    profile = g.pop('_profile', None)
+    if profile is not None:
+        profile.stop()
+
+
+def save_profile(profile, status_code):
+    """Store ``profile`` and return its id
+
+    Uses a session of its own so nothing the view left uncommitted is saved
+    along with it.
+    """
+    queries = profile.queries
+    if profile.dropped_queries:
+        queries = queries + [{'sql': f'-- {profile.dropped_queries} more statements not recorded', 'ms': 0}]
+    record = RequestProfile(
+        user_id=current_user.id,
+        method=request.method,
+        path=request.full_path.rstrip('?')[:2000],
+        endpoint=request.endpoint,
+        status_code=status_code,
+        duration_ms=profile.duration * 1000,
+        sample_count=sum(profile.stacks.values()),
+        query_count=len(profile.queries) + profile.dropped_queries,
+        query_ms=sum(query['ms'] for query in profile.queries),
+        stacks=profile.collapsed(),
+        queries=json.dumps(queries),
+    )
+    with Session(db.engine) as session:
+        session.add(record)
+        session.flush()
+        profile_id = record.id
+
+        # Keep only the newest PROFILER_KEEP profiles
+        cutoff = session.query(RequestProfile.id).order_by(RequestProfile.id.desc()).offset(
+            current_app.config['PROFILER_KEEP']
+        ).limit(1).scalar()
+        if cutoff is not None:
+            session.query(RequestProfile).filter(RequestProfile.id <= cutoff).delete(synchronize_session=False)
+        session.commit()
+    return profile_id
+
+
+def hot_frames(stacks, limit=30):
+    """Return (frame, self samples, total samples) for the busiest frames"""
+    self_samples = Counter()
+    total_samples = Counter()
+    for line in stacks.splitlines():
+        stack, _, count = line.rpartition(' ')
+        frames = stack.split(';')
+        self_samples[frames[-1]] += int(count)
+        for frame in set(frames):
+            total_samples[frame] += int(count)
+    return [(frame, self_samples[frame], total) for frame, total in total_samples.most_common(limit)]
+
+
+def query_summary(queries):
+    """Group identical statements: (sql, count, total ms), slowest first"""
+    grouped = defaultdict(lambda: [0, 0.0])
+    for query in json.loads(queries or '[]'):
+        grouped[query['sql']][0] += 1
+        grouped[query['sql']][1] += query['ms']
+    return sorted(((sql, count, ms) for sql, (count, ms) in grouped.items()), key=lambda row: row[2], reverse=True)
+
+
+def init_app(app):
+    if not app.config['PROFILER_ENABLED']:
+        return
+    app.before_request(_start_profile)
+    app.after_request(_finish_profile)
+    app.teardown_request(_discard_profile)
+    with app.app_context():
+        for engine in db.engines.values():
+            instrument_engine(app, engine)
+
+
+def instrument_engine(app, engine):
+    """Record the statements ``engine`` runs in profiles, when the profiler is on
+
+    Also called by async_db for the async views' engines (pass their
+    ``sync_engine``).
+    """
+    if app.config['PROFILER_ENABLED']:
+        event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
@@ -2,34 +2,22 @@
 Production-ready run script for Job Portal
 """
 import os
-from app import app, db, User
+import sys
+from app import app
+from commands import init_db as create_tables
 
 def init_db():
     """Initialize database and create admin user if needed"""
     with app.app_context():
-        db.create_all()
-        
-        # Create admin user if not exists
-        if not User.query.filter_by(username='admin').first():
-            admin = User(
-                username='admin',
-                email='admin@jobportal.com',
-                role='admin',
-                full_name='Admin User',
-                phone='+1-555-000-0000'
-            )
-            admin.set_password('admin123')
-            db.session.add(admin)
-            db.session.commit()
-            print("✅ Admin user created: admin@jobportal.com / admin123")
-        else:
-            print("✅ Admin user already exists")
+        create_tables(dedupe='--dedupe' in sys.argv)
 
 if __name__ == '__main__':
     print("🚀 Starting Job Portal...")
     
-    # Initialize database
-    init_db()
+    # Schema creation is opt-in so restarts don't pay for it:
+    #   python run.py --init-db   (or: flask --app app init-db)
+    if '--init-db' in sys.argv or os.environ.get('INIT_DB', 'False').lower() in ['true', '1', 'yes']:
+        init_db()
     
     # Get configuration from environment
     debug_mode = os.environ.get('DEBUG', 'True').lower() in ['true', '1', 'yes']
@@ -44,4 +32,4 @@ if __name__ == '__main__':
         host=host,
         port=port,
         debug=debug_mode
-    )
\ No newline at end of file
+    )
@@ -0,0 +1,423 @@
+"""
+Cached job searches with popular-query warming and a rate limit on misses
+
+Search filters are normalized into a ``SearchKey`` (case and spacing of the
+search text don't matter, "all" means no filter) and each worker keeps the
+ordered ids of the first ``SEARCH_CACHE_MAX_IDS`` matching jobs, plus the
+total, for the last ``SEARCH_CACHE_SIZE`` keys. A page of results is then one
+primary-key lookup instead of an ILIKE scan and a COUNT.
+
+Every ``jobs_changed`` signal bumps a generation counter kept in a small
+memory-mapped file (``SEARCH_SHARED_STATE_PATH``) shared by all worker
+processes on the host, including CLI commands, so a job write anywhere
+invalidates every worker's cache at once. Writes made on other hosts are
+picked up after ``SEARCH_CACHE_TTL_SECONDS``. Searches answered by a read
+replica are kept only for ``REPLICA_STICKY_SECONDS``, since the replica may
+not have the write yet, and clients pinned to the primary after a write
+bypass cached entries so they always see their own jobs.
+
+The same file holds a token bucket per client (user id, or IP address for
+anonymous visitors). Each uncached search takes a token, so a scraper trying
+arbitrary search strings is held to ``SEARCH_RATE_LIMIT_PER_MINUTE``
+expensive queries and gets 429 responses beyond that. Cached searches are
+never limited.
+
+Searches are counted per worker and added to ``SearchQueryStat`` every
+``SEARCH_WARM_INTERVAL_SECONDS`` by a background thread. The same thread
+re-runs the ``SEARCH_WARM_TOP`` most popular searches of the last
+``SEARCH_WARM_DAYS`` whenever the generation changes, so the common
+searches are served from the cache even right after a job is posted.
+"""
+import hashlib
+import json
+import mmap
+import os
+import random
+import struct
+import threading
+import time
+from collections import Counter, OrderedDict, namedtuple
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+from flask import abort, current_app, has_app_context, request
+from flask_login import current_user
+from flask_sqlalchemy.pagination import Pagination
+from werkzeug.datastructures import MultiDict
+
+from background import BackgroundThread
+from database import increment_or_insert, pinned_to_primary, reads_from_replica
+from extensions import db
+from models import Job, SearchQueryStat
+from signals import jobs_changed
+
+try:
+    import fcntl
+except ImportError:  # POSIX only; on Windows the state is shared by threads, not processes
+    fcntl = None
+
+_BUCKET_SLOTS = 4096
+_BUCKET_PROBES = 4
+_MAX_LOGGED_QUERY_LENGTH = 500
+_POLL_SECONDS = 2
+
+SearchKey = namedtuple('SearchKey', 'search location job_type experience min_salary radius remote')
+
+CachedSearch = namedtuple('CachedSearch', 'generation expires_at ids total')
+
+
+def normalize(args):
+    """Reduce request filters to the SearchKey they are cached under"""
+    location = ' '.join(args.get('location', '').lower().split())
+    job_type = args.get('type', '')
+    experience = args.get('experience', '')
+    return SearchKey(
+        search=' '.join(args.get('search', '').lower().split()),
+        location=location,
+        job_type='' if job_type == 'all' else job_type,
+        experience='' if experience == 'all' else experience,
+        min_salary=args.get('min_salary', type=int) or None,
+        radius=(args.get('radius', type=float) or None) if location else None,
+        remote='only' if args.get('remote') == 'only' else '',
+    )
+
+
+def key_args(key):
+    """Turn a SearchKey back into request-style arguments for filter_jobs()"""
+    names = {'job_type': 'type'}
+    return MultiDict([
+        (names.get(field, field), str(value))
+        for field, value in key._asdict().items() if value not in ('', None)
+    ])
+
+
+def _search_query(key):
+    # Imported here: the jobs blueprint imports this module
+    from blueprints.jobs import filter_jobs
+    return filter_jobs(key_args(key))
+
+
+class SharedState:
+    """Generation counter and token buckets in memory shared across processes
+
+    The file is mapped by every process that opens it; updates are
+    serialized with a POSIX record lock (and a thread lock within a process).
+    """
+
+    _HEADER = struct.Struct('8sQ')  # magic, generation
+    _BUCKET = struct.Struct('Qdd')  # client hash, tokens, last update (epoch seconds)
+    _MAGIC = b'JPSRCH01'
+
+    def __init__(self, path, slots=_BUCKET_SLOTS):
+        self.slots = slots
+        size = self._HEADER.size + slots * self._BUCKET.size
+        self._lock = threading.Lock()
+        self._fd = None
+        if fcntl is None:
+            self._map = mmap.mmap(-1, size)
+        else:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+            with self._locked():
+                if os.fstat(self._fd).st_size != size or os.pread(self._fd, 8, 0) != self._MAGIC:
+                    os.ftruncate(self._fd, 0)
+                    os.ftruncate(self._fd, size)
+                    os.pwrite(self._fd, self._MAGIC, 0)
+            self._map = mmap.mmap(self._fd, size)
+        if self._map[:8] != self._MAGIC:
+            self._map[:8] = self._MAGIC
+
+    @contextmanager
+    def _locked(self):
+        with self._lock:
+            if self._fd is not None:
+                fcntl.lockf(self._fd, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if self._fd is not None:
+                    fcntl.lockf(self._fd, fcntl.LOCK_UN)
+
+    @property
+    def generation(self):
+        return self._HEADER.unpack_from(self._map)[1]
+
+    def bump(self):
+        with self._locked():
+            generation = self.generation + 1
+            self._HEADER.pack_into(self._map, 0, self._MAGIC, generation)
+        return generation
+
+    def take_token(self, client, per_second, burst, now=None):
+        """Take one token from ``client``'s bucket; return (allowed, seconds until one is free)"""
+        now = time.time() if now is None else now
+        client_hash = int.from_bytes(hashlib.blake2b(client.encode(), digest_size=8).digest(), 'big') or 1
+        with self._locked():
+            oldest = None
+            for probe in range(_BUCKET_PROBES):
+                offset = self._HEADER.size + (client_hash + probe) % self.slots * self._BUCKET.size
+                slot_hash, tokens, updated = self._BUCKET.unpack_from(self._map, offset)
+                if slot_hash == client_hash:
+                    break
+                if oldest is None or updated < oldest[1]:
+                    oldest = (offset, updated)
+            else:
+                # New client: take over the least recently used slot with a full bucket
+                offset, tokens, updated = oldest[0], burst, now
+            tokens = min(burst, tokens + max(0.0, now - updated) * per_second)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._BUCKET.pack_into(self._map, offset, client_hash, tokens, now)
+        return allowed, 0.0 if allowed else (1 - tokens) / per_second
+
+
+class SearchCache:
+    """Per-process LRU of CachedSearch entries"""
+
+    def __init__(self, size):
+        self.size = size
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.query_counts = Counter()
+
+    def get(self, key, generation):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.generation != generation or entry.expires_at < time.monotonic():
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def count(self, key):
+        with self._lock:
+            self.query_counts[key] += 1
+
+    def take_counts(self):
+        with self._lock:
+            counts, self.query_counts = self.query_counts, Counter()
+        return counts
+
+
+_state_lock = threading.Lock()
+
+
+def _shared_state(app):
+    state = app.extensions.get('search_state')
+    if state is None:
+        with _state_lock:
+            state = app.extensions.get('search_state')
+            if state is None:
+                path = app.config['SEARCH_SHARED_STATE_PATH'] or os.path.join(app.instance_path, 'search_state.bin')
+                state = app.extensions['search_state'] = SharedState(path)
+    return state
+
+
+def run_search(key, generation):
+    """Query the ids and total for ``key`` and return them as a CachedSearch"""
+    config = current_app.config
+    max_ids = config['SEARCH_CACHE_MAX_IDS']
+    ids = [job_id for (job_id,) in _search_query(key).with_entities(Job.id).order_by(
+        Job.created_at.desc(), Job.id.desc()
+    ).limit(max_ids + 1)]
+    if len(ids) > max_ids:
+        ids = ids[:max_ids]
+        total = _search_query(key).order_by(None).count()
+    else:
+        total = len(ids)
+    return CachedSearch(generation, time.monotonic() + config['SEARCH_CACHE_TTL_SECONDS'], ids, total)
+
+
+def _client_id():
+    if current_user.is_authenticated:
+        return f'user:{current_user.id}'
+    return f'ip:{request.remote_addr}'
+
+
+def check_rate_limit():
+    """Abort with 429 when this client has used up its uncached searches"""
+    config = current_app.config
+    per_minute = config['SEARCH_RATE_LIMIT_PER_MINUTE']
+    if not per_minute:
+        return
+    allowed, retry_after = _shared_state(current_app).take_token(
+        _client_id(), per_minute / 60, config['SEARCH_RATE_LIMIT_BURST']
+    )
+    if not allowed:
+        abort(429, retry_after=max(1, int(retry_after + 0.999)))
+
+
+def lookup(args):
+    """Return the CachedSearch for the filters in ``args``, searching on a miss"""
+    app = current_app._get_current_object()
+    cache = app.extensions['search_cache']
+    key = normalize(args)
+    # Read the generation before searching, so a write that lands during
+    # the query leaves the entry already out of date
+    generation = _shared_state(app).generation
+    # A client that just wrote must see its own writes: entries filled from
+    # the replica may predate them, so search the primary again
+    entry = None if pinned_to_primary() else cache.get(key, generation)
+    if entry is None:
+        check_rate_limit()
+        entry = run_search(key, generation)
+        if reads_from_replica():
+            # The replica may not have caught up with the write that bumped the
+            # generation; keep its answer only as long as replica reads may lag
+            entry = entry._replace(expires_at=min(
+                entry.expires_at, time.monotonic() + app.config['REPLICA_STICKY_SECONDS']
+            ))
+        cache.put(key, entry)
+    cache.count(key)
+    return entry
+
+
+def load_jobs(job_ids):
+    """Load jobs by id, keeping the order of ``job_ids``"""
+    if not job_ids:
+        return []
+    jobs = {job.id: job for job in Job.query.filter(Job.id.in_(job_ids), Job.status == 'active')}
+    return [jobs[job_id] for job_id in job_ids if job_id in jobs]
+
+
+class IdListPagination(Pagination):
+    """Pagination over a page of items and a total that were already looked up"""
+
+    def __init__(self, items, total, page, per_page):
+        self._items = items
+        self._total = total
+        super().__init__(page=page, per_page=per_page, error_out=False)
+
+    def _query_items(self):
+        return self._items
+
+    def _query_count(self):
+        return self._total
+
+
+def page_ids(entry, page, per_page):
+    """Ids on ``page`` of a cached search, or None when the page is past the cached ids"""
+    start = (page - 1) * per_page
+    end = start + per_page
+    if end > len(entry.ids) and len(entry.ids) < entry.total:
+        return None
+    return entry.ids[start:end]
+
+
+def paginate(args, page, per_page):
+    """Paginate the active jobs matching ``args``, from the cache when enabled"""
+    page = max(page, 1)
+    if current_app.config['SEARCH_CACHE_ENABLED']:
+        entry = lookup(args)
+        ids = page_ids(entry, page, per_page)
+        if ids is not None:
+            return IdListPagination(load_jobs(ids), entry.total, page, per_page)
+        # Deep pages past the cached ids are as expensive as a miss
+        check_rate_limit()
+    query = _search_query(normalize(args)).order_by(Job.created_at.desc(), Job.id.desc())
+    return query.paginate(page=page, per_page=per_page, error_out=False)
+
+
+def ids_after(args, after_id, limit):
+    """Up to ``limit`` cached ids following ``after_id`` (from the start when None)
+
+    Returns None when the cache can't answer: caching is off, or the
+    cursor job isn't among the cached ids.
+    """
+    if not current_app.config['SEARCH_CACHE_ENABLED']:
+        return None
+    entry = lookup(args)
+    start = 0
+    if after_id is not None:
+        try:
+            start = entry.ids.index(after_id) + 1
+        except ValueError:
+            return None
+    if start + limit > len(entry.ids) and len(entry.ids) < entry.total:
+        return None
+    return entry.ids[start:start + limit]
+
+
+def flush_query_log(app, day=None):
+    """Add this worker's search counts to SearchQueryStat"""
+    day = day or datetime.utcnow().date()
+    counts = app.extensions['search_cache'].take_counts()
+    for key, count in counts.items():
+        params = json.dumps(key._asdict(), sort_keys=True, separators=(',', ':'))
+        if len(params) <= _MAX_LOGGED_QUERY_LENGTH:
+            increment_or_insert(db, SearchQueryStat, {'params': params, 'day': day}, {'count': count})
+    # Older days no longer count towards popularity
+    db.session.query(SearchQueryStat).filter(
+        SearchQueryStat.day < day - timedelta(days=app.config['SEARCH_WARM_DAYS'])
+    ).delete(synchronize_session=False)
+    db.session.commit()
+
+
+def popular_keys(limit, days, today=None):
+    """The ``limit`` most searched SearchKeys of the last ``days`` days"""
+    today = today or datetime.utcnow().date()
+    rows = db.session.query(SearchQueryStat.params).filter(
+        SearchQueryStat.day > today - timedelta(days=days)
+    ).group_by(SearchQueryStat.params).order_by(db.func.sum(SearchQueryStat.count).desc()).limit(limit)
+    return [SearchKey(**json.loads(params)) for (params,) in rows]
+
+
+def warm(app):
+    """Run the popular searches into this worker's cache; return how many ran"""
+    cache = app.extensions['search_cache']
+    generation = _shared_state(app).generation
+    warmed = 0
+    for key in popular_keys(app.config['SEARCH_WARM_TOP'], app.config['SEARCH_WARM_DAYS']):
+        if cache.get(key, generation) is None:
+            cache.put(key, run_search(key, generation))
+            warmed += 1
+    return warmed
+
+
+class Warmer(BackgroundThread):
+    """Per-process daemon thread flushing the query log and re-warming popular searches"""
+
+    name = 'search-warmer'
+
+    def run(self):
+        interval = self.app.config['SEARCH_WARM_INTERVAL_SECONDS']
+        self._warmed_generation = None
+        # Spread workers out so they don't all flush at the same moment
+        self._next_flush = time.monotonic() + random.uniform(0, interval)
+        while True:
+            self.call(self._tick, interval, failure='Search cache warming failed')
+            time.sleep(_POLL_SECONDS)
+
+    def _tick(self, interval):
+        if time.monotonic() >= self._next_flush:
+            flush_query_log(self.app)
+            self._next_flush = time.monotonic() + interval
+            self._warmed_generation = None  # the popular searches may have changed
+        generation = _shared_state(self.app).generation
+        if generation != self._warmed_generation and self.app.config['SEARCH_WARM_TOP']:
+            warm(self.app)
+            self._warmed_generation = generation
+
+
+@jobs_changed.connect
+def _on_jobs_changed(sender, job_ids=None, **extra):
+    if not has_app_context() or 'search_cache' not in current_app.extensions:
+        return
+    _shared_state(current_app._get_current_object()).bump()
+
+
+def init_app(app):
+    if not app.config['SEARCH_CACHE_ENABLED']:
+        return
+    app.extensions['search_cache'] = SearchCache(app.config['SEARCH_CACHE_SIZE'])
+    if not app.config['SEARCH_WARM_INTERVAL_SECONDS']:
+        return
+    warmer = app.extensions['search_warmer'] = Warmer(app)
+    warmer.start_before_requests()
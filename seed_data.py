@@ -1,7 +1,8 @@
 """
 Seed script to populate the database with realistic sample data
 """
-from app import app, db, User, Job, Application, SavedJob
+from app import create_app
+from models import db, User, Job, Application, SavedJob
 from datetime import datetime, timedelta
 import random
 
@@ -225,6 +226,7 @@ def get_requirements_template(level):
 
 def seed_database():
     """Populate database with sample data"""
+    app = create_app()
     with app.app_context():
         # Create all tables first
         print("Creating database tables...")
@@ -0,0 +1,13 @@
+"""
+Application signals for Job Portal
+
+Caches and indexes derived from the Job table subscribe to these signals
+instead of being called directly from every route that writes jobs.
+"""
+from blinker import Namespace
+
+_signals = Namespace()
+
+# Sent after job rows are created, updated or deleted. ``job_ids`` is the list
+# of affected ids, or None when the change is too broad to enumerate.
+jobs_changed = _signals.signal('jobs-changed')
@@ -147,6 +147,193 @@ window.addEventListener('scroll', function() {
     }
 });
 
+// Job listing: live filtering and infinite scroll
+// Fetches only the result cards (?format=fragment) instead of reloading the page
+function initJobListing() {
+    const list = document.getElementById('jobs-list');
+    const searchForm = document.getElementById('job-search-form');
+    const filterForm = document.getElementById('job-filter-form');
+    if (!list || !searchForm || !filterForm) return;
+
+    const sentinel = document.getElementById('jobs-sentinel');
+    const baseUrl = list.dataset.fragmentUrl;
+    let controller = null;
+    let loadingMore = false;
+
+    function filterParams() {
+        const params = new URLSearchParams();
+        const search = searchForm.elements['search'].value.trim();
+        const location = searchForm.elements['location'].value.trim();
+        const type = filterForm.elements['type'].value;
+        const experience = filterForm.elements['experience'].value;
+        const radius = filterForm.elements['radius'].value;
+        const remote = filterForm.elements['remote'].checked;
+        if (search) params.set('search', search);
+        if (location) params.set('location', location);
+        if (type && type !== 'all') params.set('type', type);
+        if (experience && experience !== 'all') params.set('experience', experience);
+        if (radius) params.set('radius', radius);
+        if (remote) params.set('remote', 'only');
+        return params;
+    }
+
+    function fetchFragment(params) {
+        const query = new URLSearchParams(params);
+        query.set('format', 'fragment');
+        return fetch(`${baseUrl}?${query}`, { signal: controller.signal }).then(function(response) {
+            if (!response.ok) throw new Error(`HTTP ${response.status}`);
+            list.dataset.nextCursor = response.headers.get('X-Next-Cursor') || '';
+            return response.text();
+        });
+    }
+
+    function hidePagination() {
+        const pagination = document.getElementById('jobs-pagination');
+        if (pagination) pagination.style.display = 'none';
+    }
+
+    function applyFilters() {
+        if (controller) controller.abort();
+        controller = new AbortController();
+        const params = filterParams();
+
+        // Keep the advanced form's hidden copies of search/location in sync
+        filterForm.elements['search'].value = params.get('search') || '';
+        filterForm.elements['location'].value = params.get('location') || '';
+
+        fetchFragment(params).then(function(html) {
+            list.innerHTML = html;
+            hidePagination();
+            const query = params.toString();
+            history.replaceState(null, '', query ? `${baseUrl}?${query}` : baseUrl);
+        }).catch(function(error) {
+            if (error.name !== 'AbortError') console.error('Failed to filter jobs', error);
+        });
+    }
+
+    function loadMore() {
+        const cursor = list.dataset.nextCursor;
+        if (!cursor || loadingMore) return;
+        loadingMore = true;
+        if (!controller) controller = new AbortController();
+
+        const params = filterParams();
+        params.set('cursor', cursor);
+        fetchFragment(params).then(function(html) {
+            list.insertAdjacentHTML('beforeend', html);
+        }).catch(function(error) {
+            if (error.name !== 'AbortError') console.error('Failed to load more jobs', error);
+        }).finally(function() {
+            loadingMore = false;
+        });
+    }
+
+    const debouncedFilter = debounce(applyFilters, 300);
+    searchForm.elements['search'].addEventListener('input', debouncedFilter);
+    searchForm.elements['location'].addEventListener('input', debouncedFilter);
+    filterForm.elements['type'].addEventListener('change', applyFilters);
+    filterForm.elements['experience'].addEventListener('change', applyFilters);
+    filterForm.elements['radius'].addEventListener('change', applyFilters);
+    filterForm.elements['remote'].addEventListener('change', applyFilters);
+
+    if (sentinel && 'IntersectionObserver' in window) {
+        hidePagination();
+        const observer = new IntersectionObserver(function(entries) {
+            if (entries.some(function(entry) { return entry.isIntersecting; })) loadMore();
+        }, { rootMargin: '400px' });
+        observer.observe(sentinel);
+    }
+}
+
+document.addEventListener('DOMContentLoaded', initJobListing);
+
+// Typeahead suggestions for inputs marked with data-autocomplete-field
+function initAutocomplete() {
+    const list = document.getElementById('jobs-list');
+    const url = list && list.dataset.autocompleteUrl;
+    if (!url) return;
+
+    document.querySelectorAll('input[data-autocomplete-field]').forEach(function(input) {
+        const datalist = document.getElementById(input.getAttribute('list'));
+        let controller = null;
+
+        const suggest = debounce(function() {
+            const prefix = input.value.trim();
+            if (controller) controller.abort();
+            if (!prefix) {
+                datalist.innerHTML = '';
+                return;
+            }
+            controller = new AbortController();
+            const query = new URLSearchParams({ q: prefix, field: input.dataset.autocompleteField });
+            fetch(`${url}?${query}`, { signal: controller.signal })
+                .then(function(response) { return response.json(); })
+                .then(function(data) {
+                    datalist.innerHTML = '';
+                    data.suggestions.forEach(function(suggestion) {
+                        const option = document.createElement('option');
+                        option.value = suggestion.text;
+                        option.label = suggestion.kind;
+                        datalist.appendChild(option);
+                    });
+                })
+                .catch(function(error) {
+                    if (error.name !== 'AbortError') console.error('Failed to load suggestions', error);
+                });
+        }, 120);
+
+        input.addEventListener('input', suggest);
+    });
+}
+
+document.addEventListener('DOMContentLoaded', initAutocomplete);
+
+// Live recruiter updates: new applications and status changes pushed over SSE
+function initLiveApplications() {
+    const source = document.querySelector('[data-events-url]');
+    if (!source || !('EventSource' in window)) return;
+
+    const list = document.getElementById('applications-list');
+    const events = new EventSource(source.dataset.eventsUrl);
+
+    events.addEventListener('application', function(message) {
+        const data = JSON.parse(message.data);
+        document.querySelectorAll(`[data-application-count="${data.job_id}"]`).forEach(function(count) {
+            count.textContent = parseInt(count.textContent, 10) + 1;
+        });
+
+        if (!list || list.dataset.jobId !== String(data.job_id)) return;
+        const url = list.dataset.itemUrl.replace(/0$/, data.id);
+        fetch(url, { credentials: 'same-origin' })
+            .then(function(response) {
+                if (!response.ok) throw new Error(`HTTP ${response.status}`);
+                return response.text();
+            })
+            .then(function(html) {
+                list.insertAdjacentHTML('afterbegin', html);
+                const empty = document.getElementById('applications-empty');
+                if (empty) empty.remove();
+            })
+            .catch(function(error) {
+                console.error('Failed to load new application', error);
+            });
+    });
+
+    events.addEventListener('status', function(message) {
+        const data = JSON.parse(message.data);
+        const select = document.querySelector(`[data-application-id="${data.id}"] select[name="status"]`);
+        if (select) select.value = data.status;
+    });
+
+    // The server dropped events for this page; reload to get back in sync
+    events.addEventListener('reset', function() {
+        events.close();
+        window.location.reload();
+    });
+}
+
+document.addEventListener('DOMContentLoaded', initLiveApplications);
+
 // Console welcome message
 console.log('%c🚀 Job Portal', 'font-size: 20px; font-weight: bold; color: #1560BD;');
 console.log('%cWelcome to Job Portal! Connect with top companies and discover opportunities.', 'font-size: 14px; color: #64748B;');
\ No newline at end of file
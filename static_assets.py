@@ -0,0 +1,134 @@
+"""
+Fingerprinted, precompressed static assets for Job Portal
+
+``flask --app app build-assets`` copies every file in ``static/`` to
+``static/dist/`` under a content-hashed name (``css/output.3f9a1c2b7e10.css``),
+writes gzip and (when the optional ``brotli`` package is installed) brotli
+variants next to it, and records the mapping in ``static/dist/manifest.json``.
+
+Templates call ``asset_url('css/output.css')`` to get the fingerprinted URL.
+Those URLs are served by the ``assets`` blueprint with the best encoding the
+client accepts and a one-year immutable cache lifetime, since the name changes
+whenever the content does. Without a manifest ``asset_url`` falls back to the
+regular ``static`` endpoint.
+"""
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import posixpath
+import shutil
+
+from flask import Blueprint, current_app, request, send_from_directory, url_for
+from werkzeug.exceptions import NotFound
+from werkzeug.security import safe_join
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip variants are always built
+    brotli = None
+
+DIST_DIRNAME = 'dist'
+MANIFEST_FILENAME = 'manifest.json'
+COMPRESSIBLE_EXTENSIONS = {'.css', '.js', '.svg', '.json', '.txt', '.html', '.map'}
+CACHE_MAX_AGE = 365 * 24 * 60 * 60
+
+# (Content-Encoding, file suffix) in order of preference
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+bp = Blueprint('assets', __name__)
+
+
+def dist_folder(app):
+    return os.path.join(app.static_folder, DIST_DIRNAME)
+
+
+def build_assets(static_folder):
+    """Fingerprint and precompress every static file; return the manifest"""
+    dist = os.path.join(static_folder, DIST_DIRNAME)
+    shutil.rmtree(dist, ignore_errors=True)
+    os.makedirs(dist)
+
+    manifest = {}
+    for root, dirs, files in os.walk(static_folder):
+        dirs[:] = sorted(d for d in dirs if os.path.join(root, d) != dist)
+        for name in sorted(files):
+            source = os.path.join(root, name)
+            logical = os.path.relpath(source, static_folder).replace(os.sep, '/')
+            with open(source, 'rb') as f:
+                data = f.read()
+
+            digest = hashlib.sha256(data).hexdigest()[:12]
+            stem, ext = posixpath.splitext(logical)
+            hashed = f'{stem}.{digest}{ext}'
+            target = os.path.join(dist, *hashed.split('/'))
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with open(target, 'wb') as f:
+                f.write(data)
+
+            if ext.lower() in COMPRESSIBLE_EXTENSIONS:
+                _write_if_smaller(target + '.gz', gzip.compress(data, compresslevel=9, mtime=0), len(data))
+                if brotli is not None:
+                    _write_if_smaller(target + '.br', brotli.compress(data, quality=11), len(data))
+
+            manifest[logical] = hashed
+
+    with open(os.path.join(dist, MANIFEST_FILENAME), 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return manifest
+
+
+def _write_if_smaller(path, compressed, original_size):
+    if len(compressed) < original_size:
+        with open(path, 'wb') as f:
+            f.write(compressed)
+
+
+def load_manifest(app):
+    """Return the asset manifest, read once per process (every call in debug)"""
+    manifest = app.extensions.get('asset_manifest')
+    if manifest is None or app.debug:
+        try:
+            with open(os.path.join(dist_folder(app), MANIFEST_FILENAME)) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            manifest = {}
+        app.extensions['asset_manifest'] = manifest
+    return manifest
+
+
+def asset_url(filename):
+    """URL for a static file, fingerprinted when the asset manifest has it"""
+    hashed = load_manifest(current_app).get(filename)
+    if hashed is None:
+        return url_for('static', filename=filename)
+    return url_for('assets.asset', filename=hashed)
+
+
+@bp.route('/assets/<path:filename>')
+def asset(filename):
+    dist = dist_folder(current_app)
+    if safe_join(dist, filename) is None or filename.endswith(tuple(suffix for _, suffix in ENCODINGS)):
+        raise NotFound()
+
+    mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    content_encoding, served = None, filename
+    for encoding, suffix in ENCODINGS:
+        variant = safe_join(dist, filename + suffix)
+        if request.accept_encodings[encoding] and variant and os.path.isfile(variant):
+            content_encoding, served = encoding, filename + suffix
+            break
+
+    response = send_from_directory(dist, served, mimetype=mimetype, max_age=CACHE_MAX_AGE)
+    if content_encoding:
+        response.headers['Content-Encoding'] = content_encoding
+    response.vary.add('Accept-Encoding')
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
+
+
+def init_app(app):
+    app.register_blueprint(bp)
+    app.add_template_global(asset_url)
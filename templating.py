@@ -0,0 +1,38 @@
+"""
+Jinja template caching for Job Portal
+
+Compiled templates are persisted with a filesystem bytecode cache, so a fresh
+worker loads bytecode instead of parsing and compiling jobs.html, base.html
+and friends on its first requests. ``precompile_templates()`` fills that cache
+ahead of time (``flask --app app precompile-templates`` in the build step) and
+can also warm the in-memory template cache at startup, which gunicorn
+``--preload`` forks then inherit.
+"""
+import os
+import time
+
+from jinja2 import FileSystemBytecodeCache
+
+def init_templates(app):
+    """Attach the bytecode cache and optionally warm templates at startup"""
+    if app.config.get('JINJA_BYTECODE_CACHE'):
+        cache_dir = app.config.get('JINJA_BYTECODE_CACHE_DIR') or os.path.join(app.instance_path, 'jinja_cache')
+        os.makedirs(cache_dir, exist_ok=True)
+        app.jinja_env.bytecode_cache = FileSystemBytecodeCache(cache_dir)
+    
+    if app.config.get('JINJA_PRELOAD_TEMPLATES'):
+        count, elapsed_ms = precompile_templates(app)
+        metrics = app.extensions.setdefault('startup_metrics', {})
+        metrics['templates_loaded'] = count
+        metrics['template_compile_ms'] = elapsed_ms
+
+def precompile_templates(app):
+    """Load every template, compiling and caching any that are not cached yet
+
+    Returns the number of templates loaded and the time taken in milliseconds.
+    """
+    started = time.perf_counter()
+    names = app.jinja_env.list_templates(filter_func=lambda name: name.endswith('.html'))
+    for name in names:
+        app.jinja_env.get_template(name)
+    return len(names), (time.perf_counter() - started) * 1000